@@ -7,20 +7,35 @@ Authentication note:
 
 from __future__ import annotations
 
+import atexit
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
-from functools import partial
+from functools import lru_cache, partial
 import logging
 import os
 from pathlib import Path
 import re
-from typing import Callable
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from skill_router import (
+    ALLOWED_SKILLS,
+    route_combined_with_model,
+    route_goal_intent_with_model,
+    route_skills_locally,
+    route_skills_with_model,
+)
+from tools import TOOL_SCHEMAS
 
-from openai import OpenAI
+if TYPE_CHECKING:
+    # Heavy imports are deferred to first use so helpers like _parse_list_count or
+    # _detect_goal_intents_keyword can be imported without loading the OpenAI SDK.
+    from openai import OpenAI
+    from openai.types.chat import ChatCompletionMessage
 
-from mcp_client import MCPClient
-from skill_router import ALLOWED_SKILLS, route_goal_intent_with_model, route_skills_with_model
-from tools import TOOL_SCHEMAS
+    from mcp_client import InProcessMCPClient, MCPClient
 
 # Basic logger used to show progress for each step in the loop.
 LOGGER = logging.getLogger(__name__)
@@ -41,6 +56,58 @@ TEMPERATURE = 0.2
 ROUTER_TEMPERATURE = 0.0
 ROUTER_MAX_COMPLETION_TOKENS = 120
 ROUTER_MAX_ATTEMPTS = 3
+# Router requests share one cache routing key: their static rules are a separate
+# system message in front of the per-goal user message.
+ROUTER_PROMPT_CACHE_KEY = "task-router"
+
+# One OpenAI client per process: its connection pool keeps TLS sessions alive across
+# router calls, agent steps, and later runs (e.g. repeated goals from the GUI).
+# The SDK already keeps connections alive; the shorter timeout bounds a stalled step.
+OPENAI_TIMEOUT_SECONDS = 60.0
+OPENAI_MAX_RETRIES = 2
+_SHARED_CLIENT: OpenAI | None = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+# Opt-in deterministic routing: when keyword rules match, skip the router model call.
+LOCAL_SKILL_ROUTER = os.getenv("LOCAL_SKILL_ROUTER") == "1"
+
+# Token-limit parameter names in preference order. The first name a model accepts is
+# remembered per model (shared by router and agent paths) and persisted to
+# MODEL_CAPS_FILE, so the rejected-parameter probe costs at most one failed request
+# per model, not one per CLI invocation.
+TOKEN_PARAM_CANDIDATES = ("max_completion_tokens", "max_tokens")
+MODEL_CAPS_FILE = Path.home() / ".cache" / "task_manager" / "model_caps.json"
+_TOKEN_PARAM_CACHE: dict[str, str] = {}
+_TOKEN_PARAM_CACHE_LOADED = False
+
+# Router calls are deterministic (temperature 0), so identical prompts can reuse output.
+ROUTER_CACHE_MAX_ENTRIES = 1024
+_ROUTER_RESPONSE_CACHE: OrderedDict[tuple, str] = OrderedDict()
+_ROUTER_CACHE_LOCK = threading.Lock()
+
+# Tool outputs older than this many steps are compacted to one-line summaries before
+# the next call; the latest output of each tool keeps full fidelity. Rewriting a message
+# invalidates the provider's cached prompt prefix from that message onward, so
+# compaction waits until it would save at least TOOL_OUTPUT_COMPACT_MIN_CHARS and then
+# rewrites everything stale in one batch. Short runs never touch the history at all.
+TOOL_OUTPUT_KEEP_STEPS = 2
+TOOL_OUTPUT_COMPACT_MIN_CHARS = 4000
+ELIDED_TOOL_OUTPUT = "[elided older tool output]"
+
+# Read-only tools may run concurrently; every other tool mutates storage and runs alone
+# in model-emitted order so results stay deterministic.
+READ_ONLY_TOOLS = frozenset({"list_tasks"})
+TOOL_CONCURRENCY_LIMIT = 4
+# Reused across steps and runs; its threads start on first use, not at import.
+_TOOL_EXECUTOR = ThreadPoolExecutor(max_workers=TOOL_CONCURRENCY_LIMIT, thread_name_prefix="tool-call")
+# One MCP server worker per concurrent tool call, so fanned-out reads really
+# run in parallel instead of queueing on a single server pipe.
+MCP_POOL_SIZE = TOOL_CONCURRENCY_LIMIT
+# MCP_TRANSPORT=local calls the server's dispatch in-process (no subprocess or JSON
+# pipe); the default keeps the separate server process the lectures demonstrate.
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "subprocess")
+_SHARED_MCP_CLIENT: MCPClient | InProcessMCPClient | None = None
+_SHARED_MCP_CLIENT_LOCK = threading.Lock()
 
 # Keep agent behavior intentionally simple: execute tools to satisfy the goal, then stop.
 SYSTEM_PROMPT = (
@@ -64,30 +131,112 @@ SKILL_FILES: dict[str, Path] = {
     "output_format": SKILLS_DIR / "output_format.md",
 }
 
+# Skill text is read once per process. Set SKILL_HOT_RELOAD=1 while editing skill
+# files to re-read them whenever a file's mtime or size changes.
+SKILL_HOT_RELOAD = bool(os.getenv("SKILL_HOT_RELOAD"))
+_SKILL_FILES_SIGNATURE: tuple[tuple[int, int], ...] | None = None
+
+
+def _get_client() -> OpenAI:
+    """Return the process-wide OpenAI client, creating it on first use."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _SHARED_CLIENT_LOCK:
+            if _SHARED_CLIENT is None:
+                from openai import OpenAI
+
+                # API key source: the client reads OPENAI_API_KEY from environment by default.
+                _SHARED_CLIENT = OpenAI(max_retries=OPENAI_MAX_RETRIES, timeout=OPENAI_TIMEOUT_SECONDS)
+    return _SHARED_CLIENT
+
 
 def _read_skill_file(path: Path) -> str:
     """Read one skill file from disk and return normalized text."""
     try:
-        return path.read_text(encoding="utf-8").strip()
+        # Plain binary read + decode skips pathlib's text-mode wrapper overhead.
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8").strip()
     except OSError as exc:
         raise RuntimeError(f"Unable to load skill file: {path}") from exc
 
 
-def _create_router_completion_with_token_compat(client: OpenAI, model: str, messages: list[dict]):
-    """Create router completion with token-parameter compatibility fallback."""
-    token_param_candidates = ["max_completion_tokens", "max_tokens"]
+def _load_token_param_cache() -> None:
+    """Merge persisted model capabilities into the in-memory cache once per process."""
+    global _TOKEN_PARAM_CACHE_LOADED
+    if _TOKEN_PARAM_CACHE_LOADED:
+        return
+    _TOKEN_PARAM_CACHE_LOADED = True
+
+    import json_codec
+
+    try:
+        persisted = json_codec.loads(MODEL_CAPS_FILE.read_bytes())
+    except (OSError, json_codec.JSONDecodeError):
+        return
+    if isinstance(persisted, dict):
+        for model, token_param in persisted.items():
+            if token_param in TOKEN_PARAM_CANDIDATES:
+                _TOKEN_PARAM_CACHE.setdefault(model, token_param)
+
+
+def _remember_token_param(model: str, token_param: str) -> None:
+    """Record the token parameter a model accepted; persist only when it is new."""
+    if _TOKEN_PARAM_CACHE.get(model) == token_param:
+        return
+    _TOKEN_PARAM_CACHE[model] = token_param
+
+    import json_codec
+
+    # The cache file is an optimization only; failing to write it is harmless.
+    try:
+        MODEL_CAPS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        MODEL_CAPS_FILE.write_bytes(json_codec.dumps_bytes(_TOKEN_PARAM_CACHE))
+    except OSError as exc:
+        LOGGER.debug("Could not persist model capabilities to %s: %s", MODEL_CAPS_FILE, exc)
+
+
+def _token_param_candidates(model: str) -> list[str]:
+    """Return token-parameter names to try, starting with the one this model accepted before."""
+    _load_token_param_cache()
+    known = _TOKEN_PARAM_CACHE.get(model)
+    if known is None:
+        return list(TOKEN_PARAM_CANDIDATES)
+    return [known] + [name for name in TOKEN_PARAM_CANDIDATES if name != known]
+
+
+def _create_router_completion_with_token_compat(
+    client: OpenAI,
+    model: str,
+    messages: list[dict],
+    *,
+    stream: bool = False,
+):
+    """Create router completion with token-parameter compatibility fallback.
+
+    With `stream=True` the chunk stream is returned; parameter errors are raised
+    by `create` before any chunk arrives, so the fallback works the same way.
+    """
+    token_param_candidates = _token_param_candidates(model)
+    # Only send `stream` when set, so non-streaming requests stay exactly as before.
+    stream_kwargs = {"stream": True} if stream else {}
 
     for idx, token_param in enumerate(token_param_candidates):
         try:
-            return client.chat.completions.create(
+            response = client.chat.completions.create(
                 model=model,
                 messages=messages,
                 temperature=ROUTER_TEMPERATURE,
+                prompt_cache_key=ROUTER_PROMPT_CACHE_KEY,
+                **stream_kwargs,
                 **{token_param: ROUTER_MAX_COMPLETION_TOKENS},
             )
+            _remember_token_param(model, token_param)
+            return response
         except Exception as exc:
+            # Render the exception text once; both the probe check and the error reuse it.
+            message = str(exc)
             is_last_attempt = idx == len(token_param_candidates) - 1
-            if _is_unsupported_token_param_error(exc, token_param) and not is_last_attempt:
+            if _is_unsupported_token_param_error(message, token_param) and not is_last_attempt:
                 LOGGER.warning(
                     "Router model '%s' rejected token parameter '%s'. Retrying with '%s'.",
                     model,
@@ -95,23 +244,73 @@ def _create_router_completion_with_token_compat(client: OpenAI, model: str, mess
                     token_param_candidates[idx + 1],
                 )
                 continue
-            raise RuntimeError(_format_openai_error_message(exc, model)) from exc
+            raise RuntimeError(_format_openai_error_message(message, model)) from exc
 
     raise RuntimeError(f"OpenAI request failed for router model '{model}'.")
 
 
+def _router_cache_key(model: str, messages: list[dict]) -> tuple:
+    """Build a hashable cache key; case and whitespace differences in goals share one entry."""
+    normalized = tuple(
+        (str(message.get("role", "")), " ".join(str(message.get("content", "")).split()).lower())
+        for message in messages
+    )
+    return model, normalized
+
+
+def clear_router_cache() -> None:
+    """Drop all cached router responses."""
+    with _ROUTER_CACHE_LOCK:
+        _ROUTER_RESPONSE_CACHE.clear()
+
+
+def remember_router_response(messages: list[dict], content: str, *, model: str | None = None) -> None:
+    """Cache one router response for `messages` once the caller has validated it.
+
+    call_router_model never caches on its own: a malformed reply stored there would
+    be replayed to every retry and every repeat of the goal without a new API call.
+    """
+    cache_key = _router_cache_key(model or DEFAULT_MODEL, messages)
+    with _ROUTER_CACHE_LOCK:
+        _ROUTER_RESPONSE_CACHE[cache_key] = content
+        _ROUTER_RESPONSE_CACHE.move_to_end(cache_key)
+        if len(_ROUTER_RESPONSE_CACHE) > ROUTER_CACHE_MAX_ENTRIES:
+            _ROUTER_RESPONSE_CACHE.popitem(last=False)
+
+
+def _stream_router_content(stream) -> Iterator[str]:
+    """Yield router text deltas and always close the underlying stream.
+
+    The router validator closes this generator early when the output cannot be
+    valid, which closes the HTTP stream instead of reading the rest of the reply.
+    """
+    try:
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+
 def call_router_model(
     prompt_or_messages: str | list[dict],
     *,
     client: OpenAI | None = None,
     model: str | None = None,
-) -> str:
+    stream: bool = False,
+) -> str | Iterator[str]:
     """Return raw router text output only.
 
     Router calls must stay cheap because routing is control-plane work, not
-    final user-facing reasoning work.
+    final user-facing reasoning work. Responses stored with
+    `remember_router_response` are reused by normalized prompt, so a repeated
+    goal skips the API round-trip.
+
+    With `stream=True`, an uncached response is returned as an iterator of text
+    chunks so the router validator can reject malformed output mid-stream.
     """
-    active_client = client or OpenAI()
     active_model = model or DEFAULT_MODEL
     if isinstance(prompt_or_messages, str):
         messages = [
@@ -120,6 +319,21 @@ def call_router_model(
         ]
     else:
         messages = prompt_or_messages
+
+    cache_key = _router_cache_key(active_model, messages)
+    with _ROUTER_CACHE_LOCK:
+        cached = _ROUTER_RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            _ROUTER_RESPONSE_CACHE.move_to_end(cache_key)
+            return cached
+
+    active_client = client or _get_client()
+    if stream:
+        completion_stream = _create_router_completion_with_token_compat(
+            active_client, active_model, messages, stream=True
+        )
+        return _stream_router_content(completion_stream)
+
     response = _create_router_completion_with_token_compat(active_client, active_model, messages)
     return response.choices[0].message.content or ""
 
@@ -129,33 +343,86 @@ def _route_skill_names(goal: str, *, client: OpenAI, model: str) -> tuple[list[s
 
     Routing affects reasoning style only; it does not change loop/tool behavior.
     """
-    # Bind client/model once so route_skills_with_model can call a single-arg router function.
-    routed_call = partial(call_router_model, client=client, model=model)
-    ok, routed_skills, reason = route_skills_with_model(goal, routed_call, max_attempts=3)
+    # Bind client/model once so route_skills_with_model can call a single-arg router function;
+    # streaming lets the validator stop a malformed reply before it finishes.
+    routed_call = partial(call_router_model, client=client, model=model, stream=True)
+    ok, routed_skills, reason = route_skills_with_model(
+        goal,
+        routed_call,
+        max_attempts=3,
+        on_valid_output=partial(remember_router_response, model=model),
+    )
 
     # Always load baseline guardrails even if router fails.
-    always_on_only = ["always_on"]
     if not ok:
-        return always_on_only, f"router_fail_fallback: {reason}"
+        return ["always_on"], f"router_fail_fallback: {reason}"
+    return _normalize_routed_skills(routed_skills), reason
+
 
+def _normalize_routed_skills(routed_skills: list[str]) -> list[str]:
+    """Return always_on first, then routed optional skills in canonical order."""
     # Router output controls optional reasoning skills only.
     optional_skills = [skill for skill in routed_skills if skill != "always_on"]
     allowed_order = list(ALLOWED_SKILLS.keys())
     ordered_optional = [skill for skill in allowed_order if skill in optional_skills]
-    return always_on_only + ordered_optional, reason
+    return ["always_on"] + ordered_optional
 
 
-def load_skills(goal: str, *, client: OpenAI, model: str) -> tuple[str, list[str], str]:
-    """Load routed skills and return concatenated text plus route metadata."""
-    selected_skills, route_reason = _route_skill_names(goal, client=client, model=model)
-    sections: list[str] = []
-    for skill_name in selected_skills:
-        skill_path = SKILL_FILES.get(skill_name)
-        if skill_path is None:
-            raise RuntimeError(f"Missing skill file mapping for '{skill_name}'.")
-        skill_text = _read_skill_file(skill_path)
-        sections.append(f"[Skill: {skill_name}]\n{skill_text}")
-    return "\n\n---\n\n".join(sections), selected_skills, route_reason
+@lru_cache(maxsize=None)
+def _get_skill_text(skill_name: str) -> str:
+    """Return one skill's text; skill files are static, so each is read once per process."""
+    skill_path = SKILL_FILES.get(skill_name)
+    if skill_path is None:
+        raise RuntimeError(f"Missing skill file mapping for '{skill_name}'.")
+    return _read_skill_file(skill_path)
+
+
+def load_skills(goal: str, *, client: OpenAI, model: str) -> tuple[list[str], str]:
+    """Route skills for one goal and return `(selected_skills, route_reason)`.
+
+    Skill text is injected by `_assemble_system_prompt`, which caches the
+    finished prompt per skill combination.
+    """
+    return _route_skill_names(goal, client=client, model=model)
+
+
+def _skill_files_signature() -> tuple[tuple[int, int], ...]:
+    """Return `(mtime_ns, size)` per skill file; missing files read as `(0, 0)`."""
+    signature = []
+    for path in SKILL_FILES.values():
+        try:
+            stat = path.stat()
+        except OSError:
+            signature.append((0, 0))
+            continue
+        # Size catches same-tick edits that coarse filesystem mtimes would hide.
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def _reload_skills_if_requested() -> None:
+    """Drop cached skill text when SKILL_HOT_RELOAD is enabled and a skill file changed."""
+    global _SKILL_FILES_SIGNATURE
+    if not SKILL_HOT_RELOAD:
+        return
+    signature = _skill_files_signature()
+    if signature != _SKILL_FILES_SIGNATURE:
+        _SKILL_FILES_SIGNATURE = signature
+        _get_skill_text.cache_clear()
+        _assemble_system_prompt.cache_clear()
+
+
+@lru_cache(maxsize=32)
+def _assemble_system_prompt(selected_skills: tuple[str, ...]) -> str:
+    """Inject the text of already-routed skills into the base system prompt.
+
+    Five skills give at most 32 ordered combinations (always_on first, the rest in
+    canonical order), and the router yields only a few, so each assembled prompt
+    is built once per process.
+    """
+    sections = [f"[Skill: {skill_name}]\n{_get_skill_text(skill_name)}" for skill_name in selected_skills]
+    skill_text = "\n\n---\n\n".join(sections)
+    return f"{SYSTEM_PROMPT}\n\n[Loaded Skills]\n{skill_text}"
 
 
 def build_system_prompt(goal: str, *, client: OpenAI, model: str) -> tuple[str, list[str], str]:
@@ -166,19 +433,22 @@ def build_system_prompt(goal: str, *, client: OpenAI, model: str) -> tuple[str,
     - Skill routing changes reasoning guidance only.
     - Agent loop, stop conditions, token handling, and tool execution stay unchanged.
     """
-    skill_text, selected_skills, route_reason = load_skills(goal, client=client, model=model)
-    return f"{SYSTEM_PROMPT}\n\n[Loaded Skills]\n{skill_text}", selected_skills, route_reason
+    selected_skills, route_reason = load_skills(goal, client=client, model=model)
+    _reload_skills_if_requested()
+    return _assemble_system_prompt(tuple(selected_skills)), selected_skills, route_reason
 
 
-def _is_unsupported_token_param_error(exc: Exception, param_name: str) -> bool:
-    """Return True when API error indicates a specific token parameter is unsupported."""
-    message = str(exc)
+def _is_unsupported_token_param_error(message: str, param_name: str) -> bool:
+    """Return True when an API error message says a specific token parameter is unsupported.
+
+    The API puts `'code': 'unsupported_parameter'` after the parameter name, so both
+    substrings are checked independently rather than as one ordered pattern.
+    """
     return "unsupported_parameter" in message and f"'{param_name}'" in message
 
 
-def _format_openai_error_message(exc: Exception, model: str) -> str:
-    """Convert low-level API exceptions into a human-readable message."""
-    message = str(exc)
+def _format_openai_error_message(message: str, model: str) -> str:
+    """Convert a low-level API exception message into a human-readable message."""
     return (
         f"OpenAI request failed for model '{model}'. "
         f"Details: {message}. "
@@ -186,6 +456,21 @@ def _format_openai_error_message(exc: Exception, model: str) -> str:
     )
 
 
+_LAST_EVENT_STAMP: tuple[int, str] = (-1, "")
+
+
+def _event_timestamp() -> str:
+    """Return the current local time as HH:MM:SS, formatted at most once per second.
+
+    Streamed token events arrive in bursts, so most calls reuse the cached string.
+    """
+    global _LAST_EVENT_STAMP
+    now = int(time.time())
+    if now != _LAST_EVENT_STAMP[0]:
+        _LAST_EVENT_STAMP = (now, time.strftime("%H:%M:%S", time.localtime(now)))
+    return _LAST_EVENT_STAMP[1]
+
+
 def _emit_event(
     on_event: Callable[[dict], None] | None,
     event_type: str,
@@ -202,7 +487,7 @@ def _emit_event(
         return
 
     payload = {
-        "timestamp": datetime.now().strftime("%H:%M:%S"),
+        "timestamp": _event_timestamp(),
         "type": event_type,
         "name": name,
         "details": details,
@@ -216,9 +501,13 @@ def _emit_event(
         LOGGER.debug("Ignoring on_event callback failure: %s", exc)
 
 
-@dataclass
+@dataclass(slots=True)
 class GoalValidationState:
-    """Track deterministic evidence used by goal-completion validator."""
+    """Track deterministic evidence used by goal-completion validator.
+
+    Slots drop the per-instance `__dict__`; the validator mutates these counters
+    once or twice per executed tool.
+    """
 
     wants_add: bool
     wants_delete: bool
@@ -231,18 +520,21 @@ class GoalValidationState:
 
 
 _TASK_LINE_PATTERN = re.compile(r"^\s*\d+\.\s+\[[ xX]\]\s+", re.MULTILINE)
-_ADD_SUCCESS_PATTERN = re.compile(r"Added task #\d+:")
-_DELETE_SUCCESS_PATTERN = re.compile(r"Deleted task #\d+:")
-_DELETE_BULK_SUCCESS_PATTERN = re.compile(r"Deleted\s+(\d+)\s+task\(s\):")
+# One alternation covers every mutation success line; the matched group name says which.
+_MUTATION_RESULT_PATTERN = re.compile(
+    r"(?P<add_task>Added task #\d+:)"
+    r"|(?P<delete_task>Deleted task #\d+:)"
+    r"|(?P<delete_tasks>Deleted\s+(?P<deleted_count>\d+)\s+task\(s\):)"
+)
+# "new task" keeps prefix semantics so "new tasks" still counts as an add request.
+_ADD_KEYWORD_PATTERN = re.compile(r"\b(?:add|create|insert)\b|\bnew\s+task", re.IGNORECASE)
+_DELETE_KEYWORD_PATTERN = re.compile(r"\b(?:delete|remove|purge|clean\s+up)\b", re.IGNORECASE)
 
 
 def _detect_goal_intents_keyword(goal: str) -> tuple[bool, bool]:
     """Keyword-only fallback for add/delete goal intent detection."""
-    text = goal.lower()
-    add_markers = (" add ", " create ", " new task", " insert ")
-    delete_markers = (" delete ", " remove ", " purge ", " clean up ")
-    wants_add = any(marker in f" {text} " for marker in add_markers)
-    wants_delete = any(marker in f" {text} " for marker in delete_markers)
+    wants_add = bool(_ADD_KEYWORD_PATTERN.search(goal))
+    wants_delete = bool(_DELETE_KEYWORD_PATTERN.search(goal))
     return wants_add, wants_delete
 
 
@@ -253,11 +545,12 @@ def _detect_goal_intents_hybrid(goal: str, *, client: OpenAI, model: str) -> tup
     - Model router handles paraphrases and richer language.
     - Deterministic fallback ensures behavior if router output is invalid.
     """
-    routed_call = partial(call_router_model, client=client, model=model)
+    routed_call = partial(call_router_model, client=client, model=model, stream=True)
     ok, intent, reason = route_goal_intent_with_model(
         goal=goal,
         call_model_fn=routed_call,
         max_attempts=ROUTER_MAX_ATTEMPTS,
+        on_valid_output=partial(remember_router_response, model=model),
     )
     if ok:
         return bool(intent["wants_add"]), bool(intent["wants_delete"]), f"model_router: {reason}"
@@ -270,6 +563,51 @@ def _detect_goal_intents_hybrid(goal: str, *, client: OpenAI, model: str) -> tup
     return wants_add, wants_delete, fallback_reason
 
 
+def _route_goal(goal: str, *, client: OpenAI, model: str) -> tuple[list[str], str, bool, bool, str]:
+    """Route skills and add/delete intent with one router call.
+
+    Returns `(skills, skill_reason, wants_add, wants_delete, intent_reason)`.
+    If the combined output never validates, fall back to the separate skill and
+    intent routers so behavior matches the two-call path.
+
+    With LOCAL_SKILL_ROUTER=1, keyword rules decide first; only goals that
+    match no rule reach the model.
+    """
+    if LOCAL_SKILL_ROUTER:
+        ok, local_skills, local_reason = route_skills_locally(goal)
+        if ok:
+            wants_add, wants_delete = _detect_goal_intents_keyword(goal)
+            return (
+                _normalize_routed_skills(local_skills),
+                f"local_router: {local_reason}",
+                wants_add,
+                wants_delete,
+                f"keyword_router: wants_add={wants_add}, wants_delete={wants_delete}",
+            )
+        LOGGER.info("Local skill router found no match; using model router.")
+
+    routed_call = partial(call_router_model, client=client, model=model, stream=True)
+    ok, routed_skills, intent, reason = route_combined_with_model(
+        goal=goal,
+        call_model_fn=routed_call,
+        max_attempts=ROUTER_MAX_ATTEMPTS,
+        on_valid_output=partial(remember_router_response, model=model),
+    )
+    if ok:
+        return (
+            _normalize_routed_skills(routed_skills),
+            reason,
+            intent["wants_add"],
+            intent["wants_delete"],
+            f"model_router: {reason}",
+        )
+
+    LOGGER.warning("Combined router failed, using separate routers: %s", reason)
+    selected_skills, skill_reason = _route_skill_names(goal, client=client, model=model)
+    wants_add, wants_delete, intent_reason = _detect_goal_intents_hybrid(goal, client=client, model=model)
+    return selected_skills, skill_reason, wants_add, wants_delete, intent_reason
+
+
 def _parse_list_count(tool_result: str) -> int | None:
     """Parse task count from list output text."""
     if "No tasks yet." in tool_result:
@@ -293,24 +631,22 @@ def _update_validation_state(state: GoalValidationState, tool_name: str, tool_re
             state.saw_post_mutation_list = True
         return
 
-    if tool_name == "add_task" and _ADD_SUCCESS_PATTERN.search(tool_result):
-        state.add_success_count += 1
-        state.saw_mutation = True
-        return
-
-    if tool_name == "delete_task" and _DELETE_SUCCESS_PATTERN.search(tool_result):
-        state.delete_success_count += 1
-        state.saw_mutation = True
-        return
-
-    if tool_name == "delete_tasks":
-        match = _DELETE_BULK_SUCCESS_PATTERN.search(tool_result)
-        if not match:
-            return
-        deleted_count = int(match.group(1))
-        if deleted_count > 0:
-            state.delete_success_count += deleted_count
+    # Group names equal tool names, so only the success line produced by this tool counts.
+    # Each tool result reports one operation; later matches can only come from task titles.
+    for match in _MUTATION_RESULT_PATTERN.finditer(tool_result):
+        if match.lastgroup != tool_name:
+            continue
+        if tool_name == "add_task":
+            state.add_success_count += 1
+            state.saw_mutation = True
+        elif tool_name == "delete_task":
+            state.delete_success_count += 1
             state.saw_mutation = True
+        else:
+            deleted_count = int(match.group("deleted_count"))
+            if deleted_count > 0:
+                state.delete_success_count += deleted_count
+                state.saw_mutation = True
         return
 
 
@@ -379,29 +715,244 @@ def _build_validation_feedback(state: GoalValidationState, reason: str) -> str:
     )
 
 
-def _create_chat_completion_with_token_compat(client: OpenAI, model: str, messages: list[dict]):
-    """Create chat completion with compatibility fallback for token-limit parameter names.
+def _run_concurrently(*funcs: Callable[[], object]) -> list[object]:
+    """Run blocking callables in worker threads and wait for all of them.
+
+    Returns each callable's result, or the exception it raised, in argument order.
+    Plain threads (not asyncio.run) keep callers that already run an event loop working.
+    """
+    with ThreadPoolExecutor(max_workers=len(funcs)) as pool:
+        futures = [pool.submit(func) for func in funcs]
+    return [future.exception() or future.result() for future in futures]
+
+
+def _tool_response_text(tool_response: dict) -> str:
+    """Convert one MCP response dictionary into the text sent back to the model."""
+    if tool_response.get("status") == "ok":
+        return str(tool_response.get("result", "OK"))
+    return str(tool_response.get("error", "Unknown tool error"))
+
+
+def _run_tool_call(mcp_client: MCPClient, tool_name: str, tool_args: str) -> str:
+    """Execute one tool call through MCP transport and return result text."""
+    try:
+        # Argument parsing/normalization is handled inside MCPClient,
+        # so agent code stays focused on loop orchestration only.
+        tool_response = mcp_client.request(tool_name, tool_args)
+    except Exception as exc:  # pragma: no cover - defensive guard for runtime tool errors
+        return f"Error executing tool '{tool_name}': {exc}"
+    return _tool_response_text(tool_response)
+
+
+def _execute_tool_calls(mcp_client: MCPClient, tool_calls: list) -> list[str]:
+    """Execute one step's tool calls and return results in the original call order.
+
+    Consecutive read-only calls run concurrently on the shared tool thread pool.
+    Consecutive mutating calls act as one barrier: they wait for pending reads, then
+    go to the server as a single ordered batch (one round trip instead of one per call).
+    """
+    results: list[str] = [""] * len(tool_calls)
+    pending_reads: list[int] = []
+    pending_writes: list[int] = []
+
+    def run_one(idx: int) -> str:
+        call = tool_calls[idx]
+        return _run_tool_call(mcp_client, call.function.name, call.function.arguments or "")
+
+    def flush_reads() -> None:
+        if len(pending_reads) == 1:
+            results[pending_reads[0]] = run_one(pending_reads[0])
+        elif pending_reads:
+            for idx, outcome in zip(pending_reads, _TOOL_EXECUTOR.map(run_one, pending_reads)):
+                results[idx] = outcome
+        pending_reads.clear()
+
+    def flush_writes() -> None:
+        if len(pending_writes) == 1:
+            results[pending_writes[0]] = run_one(pending_writes[0])
+        elif pending_writes:
+            calls = [
+                (tool_calls[idx].function.name, tool_calls[idx].function.arguments or "")
+                for idx in pending_writes
+            ]
+            try:
+                responses = mcp_client.request_many(calls)
+            except Exception as exc:  # pragma: no cover - defensive guard for runtime tool errors
+                responses = [
+                    {"status": "error", "error": f"Error executing tool '{name}': {exc}"} for name, _ in calls
+                ]
+            for idx, tool_response in zip(pending_writes, responses):
+                results[idx] = _tool_response_text(tool_response)
+        pending_writes.clear()
+
+    for idx, call in enumerate(tool_calls):
+        if call.function.name in READ_ONLY_TOOLS:
+            flush_writes()
+            pending_reads.append(idx)
+        else:
+            flush_reads()
+            pending_writes.append(idx)
+    flush_reads()
+    flush_writes()
+    return results
+
+
+def _collect_streamed_message(
+    stream,
+    on_content: Callable[[str], None] | None = None,
+) -> ChatCompletionMessage:
+    """Assemble streamed chunks into one assistant message.
+
+    Tool-call fragments arrive keyed by `index`; ids and names come once and
+    argument JSON arrives in pieces, so fragments are concatenated per index.
+    Each content fragment is also passed to `on_content` as soon as it arrives.
+    """
+    from openai.types.chat import ChatCompletionMessage
+
+    content_parts: list[str] = []
+    tool_calls: dict[int, dict] = {}
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+        if delta.content:
+            content_parts.append(delta.content)
+            if on_content is not None:
+                on_content(delta.content)
+        for fragment in delta.tool_calls or []:
+            entry = tool_calls.setdefault(
+                fragment.index,
+                {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+            )
+            if fragment.id:
+                entry["id"] = fragment.id
+            if fragment.function is not None:
+                if fragment.function.name:
+                    entry["function"]["name"] += fragment.function.name
+                if fragment.function.arguments:
+                    entry["function"]["arguments"] += fragment.function.arguments
+
+    return ChatCompletionMessage.model_validate(
+        {
+            "role": "assistant",
+            "content": "".join(content_parts) or None,
+            "tool_calls": [tool_calls[idx] for idx in sorted(tool_calls)] or None,
+        }
+    )
+
+
+def _summarize_tool_output(tool_name: str, step: int, content: str) -> str:
+    """Return a one-line stand-in for an old tool output."""
+    if tool_name == "list_tasks":
+        count = _parse_list_count(content)
+        if count is not None:
+            return f"[list_tasks @ step {step}: {count} tasks, truncated]"
+        return ELIDED_TOOL_OUTPUT
+
+    match = _MUTATION_RESULT_PATTERN.search(content)
+    if match is not None and match.lastgroup == tool_name:
+        return f"[{tool_name} OK]"
+    return ELIDED_TOOL_OUTPUT
+
+
+def _compact_stale_tool_outputs(
+    messages: list[dict],
+    tool_messages: list[tuple[int, int, str]],
+    current_step: int,
+) -> None:
+    """Compact tool outputs older than TOOL_OUTPUT_KEEP_STEPS into short summaries.
+
+    `tool_messages` holds `(step, message_index, tool_name)` for every tool message
+    not yet compacted. The most recent output of each tool stays intact (the model
+    reads ids from the latest list). Compacted entries are dropped from the list,
+    so each message is rewritten at most once and stays stable afterwards.
+    """
+    cutoff = current_step - TOOL_OUTPUT_KEEP_STEPS
+    latest_index_by_tool = {tool_name: message_index for _, message_index, tool_name in tool_messages}
+    pending: list[tuple[int, int, str]] = []
+    rewrites: list[tuple[dict, str]] = []
+    saved_chars = 0
+    for entry in tool_messages:
+        step, message_index, tool_name = entry
+        if step > cutoff or latest_index_by_tool[tool_name] == message_index:
+            pending.append(entry)
+            continue
+        message = messages[message_index]
+        summary = _summarize_tool_output(tool_name, step, message["content"])
+        if len(summary) < len(message["content"]):
+            rewrites.append((message, summary))
+            saved_chars += len(message["content"]) - len(summary)
+
+    # Not worth a prompt-cache miss yet; keep everything eligible for a later batch.
+    if saved_chars < TOOL_OUTPUT_COMPACT_MIN_CHARS:
+        return
+    for message, summary in rewrites:
+        message["content"] = summary
+    tool_messages[:] = pending
+
+
+def _assistant_message_to_dict(message: ChatCompletionMessage) -> dict:
+    """Convert an assistant message to the minimal history dict the API expects.
+
+    Equivalent to `model_dump(exclude_none=True)` for the fields the API reads
+    back, without pydantic's recursive serialization on every step.
+    """
+    payload: dict = {"role": "assistant"}
+    if message.content is not None:
+        payload["content"] = message.content
+    if message.tool_calls:
+        payload["tool_calls"] = [
+            {
+                "id": call.id,
+                "type": "function",
+                "function": {"name": call.function.name, "arguments": call.function.arguments},
+            }
+            for call in message.tool_calls
+        ]
+    return payload
+
+
+def _create_chat_completion_with_token_compat(
+    client: OpenAI,
+    model: str,
+    messages: list[dict],
+    prompt_cache_key: str | None = None,
+    on_content: Callable[[str], None] | None = None,
+) -> ChatCompletionMessage:
+    """Stream one chat completion and return the assembled assistant message.
 
     Some models accept `max_completion_tokens`; others accept `max_tokens`.
     This wrapper tries both so switching models does not crash the app.
+    Unsupported-parameter errors surface when the request is created, before
+    any chunk is consumed, so the fallback works unchanged with streaming.
+    The accepted name is remembered per model, so later calls skip the probe.
+    `prompt_cache_key` groups requests that share a system prompt so the
+    provider routes them to the same prompt cache.
     """
-    token_param_candidates = ["max_completion_tokens", "max_tokens"]
+    token_param_candidates = _token_param_candidates(model)
+    cache_kwargs = {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else {}
 
     for idx, token_param in enumerate(token_param_candidates):
         try:
-            return client.chat.completions.create(
+            stream = client.chat.completions.create(
                 model=model,
                 messages=messages,
                 # Tool schemas are defined in tools.py so the agent does not own task logic.
                 tools=TOOL_SCHEMAS,
                 tool_choice="auto",
                 temperature=TEMPERATURE,
+                stream=True,
+                **cache_kwargs,
                 # Token guardrail remains capped at 800 completion tokens per call.
                 **{token_param: MAX_COMPLETION_TOKENS_PER_CALL},
             )
+            _remember_token_param(model, token_param)
+            return _collect_streamed_message(stream, on_content)
         except Exception as exc:
+            # Render the exception text once; both the probe check and the error reuse it.
+            message = str(exc)
             is_last_attempt = idx == len(token_param_candidates) - 1
-            if _is_unsupported_token_param_error(exc, token_param) and not is_last_attempt:
+            if _is_unsupported_token_param_error(message, token_param) and not is_last_attempt:
                 LOGGER.warning(
                     "Model '%s' rejected token parameter '%s'. Retrying with '%s'.",
                     model,
@@ -409,12 +960,45 @@ def _create_chat_completion_with_token_compat(client: OpenAI, model: str, messag
                     token_param_candidates[idx + 1],
                 )
                 continue
-            raise RuntimeError(_format_openai_error_message(exc, model)) from exc
+            raise RuntimeError(_format_openai_error_message(message, model)) from exc
 
     # Defensive fallback; logically unreachable.
     raise RuntimeError(f"OpenAI request failed for model '{model}'.")
 
 
+def _create_mcp_client() -> MCPClient | InProcessMCPClient:
+    """Return an unstarted MCP client for the configured MCP_TRANSPORT."""
+    from mcp_client import InProcessMCPClient, MCPClient
+
+    if MCP_TRANSPORT == "local":
+        return InProcessMCPClient()
+    if MCP_TRANSPORT != "subprocess":
+        raise ValueError(f"MCP_TRANSPORT must be 'local' or 'subprocess', got {MCP_TRANSPORT!r}")
+    return MCPClient(pool_size=MCP_POOL_SIZE)
+
+
+def _get_mcp_client() -> MCPClient | InProcessMCPClient:
+    """Return the process-wide started MCP client, starting it on first use.
+
+    Repeated goals (e.g. from the GUI) reuse the same server workers instead of
+    spawning new ones per run; the client is closed when the process exits.
+    """
+    global _SHARED_MCP_CLIENT
+    with _SHARED_MCP_CLIENT_LOCK:
+        if _SHARED_MCP_CLIENT is None:
+            mcp_client = _create_mcp_client()
+            mcp_client.start()
+            atexit.register(mcp_client.close)
+            _SHARED_MCP_CLIENT = mcp_client
+        return _SHARED_MCP_CLIENT
+
+
+def warm_up() -> None:
+    """Create the shared OpenAI and MCP clients ahead of the first goal."""
+    _get_client()
+    _get_mcp_client()
+
+
 def run_agent(
     goal: str,
     *,
@@ -426,33 +1010,44 @@ def run_agent(
     if not goal.strip():
         raise ValueError("goal must be a non-empty string")
 
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s [%(levelname)s] %(message)s",
-    )
-
-    # API key source: this client uses OPENAI_API_KEY from environment by default.
-    client = OpenAI()
+    client = _get_client()
     chosen_model = model or DEFAULT_MODEL
+
+    # One router call yields both the skill set and the add/delete intent. It waits on
+    # the network while the first run's MCP startup waits on a process spawn, so that
+    # run does both side by side. Later runs reuse the already-started shared client
+    # and route on this thread alone.
+    route = partial(_route_goal, goal, client=client, model=chosen_model)
+    routed = None
+    mcp_client = _SHARED_MCP_CLIENT
+    if mcp_client is None:
+        routed, mcp_client = _run_concurrently(route, _get_mcp_client)
+        if isinstance(mcp_client, BaseException):
+            raise mcp_client
     try:
-        system_prompt, selected_skills, route_reason = build_system_prompt(
-            goal,
-            client=client,
-            model=chosen_model,
-        )
+        if routed is None:
+            routed = route()
+        elif isinstance(routed, BaseException):
+            raise routed
+        selected_skills, route_reason, wants_add, wants_delete, intent_reason = routed
+        _reload_skills_if_requested()
+        system_prompt = _assemble_system_prompt(tuple(selected_skills))
+        # Runs with the same skill set share a byte-identical system prompt.
+        prompt_cache_key = "task-agent:" + "+".join(selected_skills)
     except RuntimeError as exc:
         LOGGER.error("%s", exc)
         _emit_event(on_event, "error", "skill_routing", str(exc))
         return str(exc)
 
-    mcp_client = MCPClient()
-    mcp_client.start()
     _emit_event(on_event, "agent_start", "run_agent", f"model={chosen_model}")
     _emit_event(on_event, "skill_route", "model_router", route_reason)
     for skill_name in selected_skills:
         _emit_event(on_event, "skill_used", skill_name, "Injected into system prompt.")
+    _emit_event(on_event, "intent_route", "goal_intent_router", intent_reason)
 
     # Message history list: this is the full conversation state sent on every model call.
+    # The system/user prefix never changes within a run; new state is only appended at
+    # the tail so the provider's prompt cache can reuse the prefix on every step.
     messages: list[dict] = [
         {
             "role": "system",
@@ -464,105 +1059,77 @@ def run_agent(
     # AGENT LOOP:
     # This loop is unchanged: same step control, history updates, and stopping conditions.
     # Only the tool execution transport changed (direct call -> MCP client request).
-    try:
-        # If the model later returns empty output, we can still return useful data
-        # from the most recent successful tool execution.
-        wants_add, wants_delete, intent_reason = _detect_goal_intents_hybrid(
-            goal,
-            client=client,
-            model=chosen_model,
-        )
-        _emit_event(on_event, "intent_route", "goal_intent_router", intent_reason)
-        validation_state = GoalValidationState(wants_add=wants_add, wants_delete=wants_delete)
-        last_tool_result: str | None = None
-        for step in range(1, max_steps + 1):
-            LOGGER.info("Step %s/%s: requesting model response", step, max_steps)
-            _emit_event(on_event, "step_start", f"step_{step}", f"{step}/{max_steps}", step=step)
+    validation_state = GoalValidationState(wants_add=wants_add, wants_delete=wants_delete)
+    # If the model later returns empty output, we can still return useful data
+    # from the most recent successful tool execution.
+    last_tool_result: str | None = None
+    tool_messages: list[tuple[int, int, str]] = []
+    for step in range(1, max_steps + 1):
+        LOGGER.info("Step %s/%s: requesting model response", step, max_steps)
+        _compact_stale_tool_outputs(messages, tool_messages, step)
+        _emit_event(on_event, "step_start", f"step_{step}", f"{step}/{max_steps}", step=step)
 
-            try:
-                response = _create_chat_completion_with_token_compat(
-                    client=client,
-                    model=chosen_model,
-                    messages=messages,
+        try:
+            assistant_message = _create_chat_completion_with_token_compat(
+                client=client,
+                model=chosen_model,
+                messages=messages,
+                prompt_cache_key=prompt_cache_key,
+                # Forward answer text as it streams so the GUI can show it before the step ends.
+                on_content=partial(_emit_event, on_event, "token", "assistant", step=step) if on_event else None,
+            )
+        except RuntimeError as exc:
+            # Human-readable failure path: return clean message instead of raw traceback.
+            LOGGER.error("%s", exc)
+            _emit_event(on_event, "error", "openai_request", str(exc), step=step)
+            return str(exc)
+
+        tool_calls = assistant_message.tool_calls or []
+        assistant_text = assistant_message.content or ""
+
+        # Keep the assistant message in history exactly as returned so the next step has full context.
+        messages.append(_assistant_message_to_dict(assistant_message))
+
+        # TOOL CALL PROCESSING:
+        # If the assistant asks for tools, we execute stub handlers and append tool outputs.
+        if tool_calls:
+            LOGGER.info("Step %s: processing %s tool call(s)", step, len(tool_calls))
+            for call in tool_calls:
+                LOGGER.info("Tool call id=%s name=%s", call.id, call.function.name)
+                _emit_event(on_event, "tool_called", call.function.name, call.function.arguments or "", step=step)
+
+            # Execution layer only: send tool calls through MCP transport.
+            # Independent read-only calls overlap; results come back in call order.
+            tool_results = _execute_tool_calls(mcp_client, tool_calls)
+
+            for call, tool_result in zip(tool_calls, tool_results):
+                tool_name = call.function.name
+                _emit_event(on_event, "tool_result", tool_name, tool_result, step=step)
+
+                # isspace() checks in place; strip() would copy every tool output.
+                if tool_result and not tool_result.isspace():
+                    last_tool_result = tool_result
+
+                _update_validation_state(validation_state, tool_name, tool_result)
+
+                tool_messages.append((step, len(messages), tool_name))
+                messages.append(
+                    {
+                        # This marks the message as tool output.
+                        "role": "tool",
+                        # Must match the tool call id generated by the model.
+                        "tool_call_id": call.id,
+                        # Tool name for readability/debugging.
+                        "name": tool_name,
+                        # The actual tool result sent back to the model.
+                        "content": tool_result,
+                    }
                 )
-            except RuntimeError as exc:
-                # Human-readable failure path: return clean message instead of raw traceback.
-                LOGGER.error("%s", exc)
-                _emit_event(on_event, "error", "openai_request", str(exc), step=step)
-                return str(exc)
-
-            assistant_message = response.choices[0].message
-            tool_calls = assistant_message.tool_calls or []
-            assistant_text = assistant_message.content or ""
-
-            # Keep the assistant message in history exactly as returned so the next step has full context.
-            messages.append(assistant_message.model_dump(exclude_none=True))
-
-            # TOOL CALL PROCESSING:
-            # If the assistant asks for tools, we execute stub handlers and append tool outputs.
-            if tool_calls:
-                LOGGER.info("Step %s: processing %s tool call(s)", step, len(tool_calls))
-                for call in tool_calls:
-                    tool_name = call.function.name
-                    tool_args = call.function.arguments or ""
-                    LOGGER.info("Tool call id=%s name=%s", call.id, tool_name)
-                    _emit_event(on_event, "tool_called", tool_name, tool_args, step=step)
-
-                    # Execution layer only: send tool calls through MCP transport.
-                    # The agent remains unchanged as an orchestrator (loop/history/stop logic).
-                    try:
-                        # Argument parsing/normalization is handled inside MCPClient,
-                        # so agent code stays focused on loop orchestration only.
-                        tool_response = mcp_client.request(tool_name, tool_args)
-                        if tool_response.get("status") == "ok":
-                            tool_result = str(tool_response.get("result", "OK"))
-                            _emit_event(on_event, "tool_result", tool_name, tool_result, step=step)
-                        else:
-                            tool_result = str(tool_response.get("error", "Unknown tool error"))
-                            _emit_event(on_event, "tool_result", tool_name, tool_result, step=step)
-                    except Exception as exc:  # pragma: no cover - defensive guard for runtime tool errors
-                        tool_result = f"Error executing tool '{tool_name}': {exc}"
-                        _emit_event(on_event, "tool_result", tool_name, tool_result, step=step)
-
-                    if tool_result.strip():
-                        last_tool_result = tool_result
-
-                    _update_validation_state(validation_state, tool_name, tool_result)
-
-                    messages.append(
-                        {
-                            # This marks the message as tool output.
-                            "role": "tool",
-                            # Must match the tool call id generated by the model.
-                            "tool_call_id": call.id,
-                            # Tool name for readability/debugging.
-                            "name": tool_name,
-                            # The actual tool result sent back to the model.
-                            "content": tool_result,
-                        }
-                    )
-                continue
+            continue
 
-            # STOPPING CONDITIONS:
-            # Condition 1: assistant returned a normal answer with no tool calls, so we can stop early.
-            if assistant_text.strip():
-                is_valid, validation_reason = _validate_goal_completion(validation_state)
-                if not is_valid:
-                    _emit_event(on_event, "validation", "not_done", validation_reason, step=step)
-                    messages.append(
-                        {
-                            "role": "system",
-                            "content": _build_validation_feedback(validation_state, validation_reason),
-                        }
-                    )
-                    continue
-
-                LOGGER.info("Stopping at step %s: final answer received", step)
-                _emit_event(on_event, "stop", "final_answer", "Final answer produced.", step=step)
-                return assistant_text
-
-            # Condition 2: no tool calls and empty output; stop to avoid useless iterations.
-            LOGGER.info("Stopping at step %s: empty response with no tool calls", step)
+        # STOPPING CONDITIONS:
+        # Condition 1: assistant returned a normal answer with no tool calls, so we can stop early.
+        if assistant_text.strip():
             is_valid, validation_reason = _validate_goal_completion(validation_state)
             if not is_valid:
                 _emit_event(on_event, "validation", "not_done", validation_reason, step=step)
@@ -574,22 +1141,37 @@ def run_agent(
                 )
                 continue
 
-            if last_tool_result is not None:
-                _emit_event(
-                    on_event,
-                    "stop",
-                    "empty_response_with_tool_fallback",
-                    "No tool calls and empty assistant output; returning last tool result.",
-                    step=step,
-                )
-                return last_tool_result
+            LOGGER.info("Stopping at step %s: final answer received", step)
+            _emit_event(on_event, "stop", "final_answer", "Final answer produced.", step=step)
+            return assistant_text
+
+        # Condition 2: no tool calls and empty output; stop to avoid useless iterations.
+        LOGGER.info("Stopping at step %s: empty response with no tool calls", step)
+        is_valid, validation_reason = _validate_goal_completion(validation_state)
+        if not is_valid:
+            _emit_event(on_event, "validation", "not_done", validation_reason, step=step)
+            messages.append(
+                {
+                    "role": "system",
+                    "content": _build_validation_feedback(validation_state, validation_reason),
+                }
+            )
+            continue
+
+        if last_tool_result is not None:
+            _emit_event(
+                on_event,
+                "stop",
+                "empty_response_with_tool_fallback",
+                "No tool calls and empty assistant output; returning last tool result.",
+                step=step,
+            )
+            return last_tool_result
 
-            _emit_event(on_event, "stop", "empty_response", "No tool calls and empty assistant output.", step=step)
-            return "No final answer produced."
+        _emit_event(on_event, "stop", "empty_response", "No tool calls and empty assistant output.", step=step)
+        return "No final answer produced."
 
-        # Condition 3: hard cap reached (max_steps=5 by default).
-        LOGGER.info("Stopping: reached max_steps=%s", max_steps)
-        _emit_event(on_event, "stop", "max_steps", f"Reached max_steps={max_steps}.", step=max_steps)
-        return f"Stopped after reaching max_steps={max_steps}."
-    finally:
-        mcp_client.close()
+    # Condition 3: hard cap reached (max_steps=5 by default).
+    LOGGER.info("Stopping: reached max_steps=%s", max_steps)
+    _emit_event(on_event, "stop", "max_steps", f"Reached max_steps={max_steps}.", step=max_steps)
+    return f"Stopped after reaching max_steps={max_steps}."
@@ -0,0 +1,44 @@
+"""JSON encode/decode helpers that prefer `orjson` and fall back to the stdlib.
+
+`orjson` is an optional speed-up: it parses and serializes in C and returns
+`bytes` directly. When it is not installed, the same functions use `json`, so
+every caller keeps working with the standard library only.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the local environment
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause
+# (and its `.msg` attribute) works for both backends.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode one JSON document from text or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode one object as UTF-8 JSON bytes, compact or indented by two spaces.
+
+    Raises TypeError for values that are not JSON-serializable.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Encode one object as compact JSON text."""
+    return dumps_bytes(obj).decode("utf-8")
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import argparse
+import logging
+import threading
 from typing import Callable
 
 from storage import add_task, delete_task, list_tasks, mark_done
@@ -64,12 +66,26 @@ def run_goal(goal: str, on_event: Callable[[dict], None] | None = None) -> str:
 
     try:
         result = run_agent(goal, on_event=on_event)
+    except ModuleNotFoundError as exc:
+        # agent.py imports the OpenAI SDK on first use, so a missing package surfaces here.
+        return f"Agent mode unavailable: missing dependency ({exc})."
     except Exception as exc:
         return f"Agent execution failed: {exc}"
 
     return result or "No result returned."
 
 
+def _warm_up_agent() -> None:
+    """Create agent clients ahead of time so the first GUI goal starts warm."""
+    try:
+        from agent import warm_up
+
+        warm_up()
+    except Exception:
+        # Best effort only: run_goal reports real failures when a goal actually runs.
+        logging.getLogger(__name__).debug("Agent warm-up failed", exc_info=True)
+
+
 def launch_gui() -> None:
     """Launch GUI mode.
 
@@ -79,6 +95,9 @@ def launch_gui() -> None:
     # Lazy import avoids GUI dependency loading unless user explicitly asks for it.
     from ui import create_window
 
+    # Import the SDK and start MCP workers while the window is being built and shown.
+    threading.Thread(target=_warm_up_agent, daemon=True).start()
+
     # Inject shared backend function so UI does not import this module directly.
     app = create_window(run_goal)
     app.mainloop()
@@ -90,6 +109,12 @@ def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
+    # Configure logging once per process; the agent logs step progress through it.
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+    )
+
     if args.gui and args.goal:
         parser.error("Use either --gui or --goal, not both.")
 
@@ -109,14 +134,15 @@ def main() -> None:
             print(result)
         return
 
+    # Storage functions return their messages; printing is the CLI's job.
     if args.command == "add":
-        add_task(args.title)
+        print(add_task(args.title))
     elif args.command == "list":
-        list_tasks()
+        print(list_tasks())
     elif args.command == "done":
-        mark_done(args.id)
+        print(mark_done(args.id))
     elif args.command == "delete":
-        delete_task(args.id)
+        print(delete_task(args.id))
     else:
         parser.error("Provide --gui, --goal, or one subcommand: add, list, done, delete.")
 
@@ -9,71 +9,120 @@ How this simulates real MCP architecture:
 - Real MCP deployments often have a host/client process and a separate tool server process.
 - Even though both files are local here, we still use a transport boundary (stdin/stdout JSON).
 - This keeps integration behavior realistic while staying simple and synchronous.
+
+Worker pool:
+- `pool_size` starts several identical server processes. Each request borrows one
+  idle worker, so independent tool calls from concurrent callers run in parallel
+  instead of queueing on a single pipe.
+
+In-process transport:
+- `InProcessMCPClient` has the same interface but calls `mcp_server.dispatch`
+  directly: no subprocess, pipes, or JSON encoding per call. Use it when the
+  transport boundary itself is not what you want to demonstrate.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+from functools import lru_cache
+import queue
 import subprocess
 import sys
 from pathlib import Path
 
+import json_codec
+
+PIPE_BUFFER_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=64)
+def _envelope_prefix(tool: str) -> bytes:
+    """Return the encoded request envelope up to the arguments value for one tool.
+
+    The agent only ever calls a handful of tools, so each prefix is encoded once
+    and every later request is a concatenation onto a cached template.
+    """
+    return b'{"tool":' + json_codec.dumps_bytes(tool) + b',"arguments":'
+
+
+def _normalize_arguments(arguments: dict | str | None) -> tuple[dict | None, str | None]:
+    """Normalize tool arguments into a dictionary for transport.
+
+    Ownership note:
+    - The model provides tool arguments as JSON text.
+    - This client owns protocol adaptation, so JSON-string -> dict conversion happens here,
+      not in the agent loop.
+    """
+    if arguments is None:
+        return {}, None
+
+    if isinstance(arguments, dict):
+        return arguments, None
+
+    if isinstance(arguments, str):
+        text = arguments.strip()
+        if not text:
+            return {}, None
+        try:
+            parsed = json_codec.loads(text)
+        except json_codec.JSONDecodeError as exc:
+            return None, f"'arguments' JSON is invalid: {exc.msg}"
+        if not isinstance(parsed, dict):
+            return None, "'arguments' JSON must decode to an object"
+        return parsed, None
+
+    return None, "'arguments' must be a dictionary, JSON string, or None"
+
 
 class MCPClient:
     """Synchronous client for line-delimited JSON MCP requests/responses."""
 
-    def __init__(self, server_script: str = "mcp_server.py") -> None:
+    def __init__(self, server_script: str = "mcp_server.py", pool_size: int = 1) -> None:
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
         # Resolve server path relative to this file for predictable local behavior.
         self._server_path = Path(__file__).with_name(server_script)
-        self._proc: subprocess.Popen[str] | None = None
-
-    def start(self) -> None:
-        """Start the MCP server subprocess if not already running."""
-        if self._proc is not None and self._proc.poll() is None:
-            return
-
-        if not self._server_path.exists():
-            raise RuntimeError(f"Server script not found: {self._server_path}")
-
+        self._pool_size = pool_size
+        self._procs: list[subprocess.Popen[bytes]] = []
+        # Indices of workers not currently serving a request. Taking an index gives
+        # the caller exclusive use of that worker's pipes, so concurrent callers
+        # (e.g. `asyncio.to_thread` fan-out in the agent) never interleave lines.
+        self._idle: queue.SimpleQueue[int] = queue.SimpleQueue()
+
+    def _spawn(self) -> subprocess.Popen[bytes]:
+        """Start one server subprocess."""
         try:
-            self._proc = subprocess.Popen(
+            # Binary pipes: JSON lines are encoded/decoded as UTF-8 bytes directly.
+            # The buffer matches the default Linux pipe capacity, so a large response
+            # (e.g. a long task list) is pulled in one read instead of 8 KiB at a time.
+            return subprocess.Popen(
                 [sys.executable, str(self._server_path)],
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
+                bufsize=PIPE_BUFFER_SIZE,
             )
         except OSError as exc:
             raise RuntimeError(f"Failed to start MCP server: {exc}") from exc
 
-    def _normalize_arguments(self, arguments: dict | str | None) -> tuple[dict | None, str | None]:
-        """Normalize tool arguments into a dictionary for transport.
-
-        Ownership note:
-        - The model provides tool arguments as JSON text.
-        - This client owns protocol adaptation, so JSON-string -> dict conversion happens here,
-          not in the agent loop.
-        """
-        if arguments is None:
-            return {}, None
+    def start(self) -> None:
+        """Start the MCP server worker pool if not already running."""
+        if self._procs:
+            return
 
-        if isinstance(arguments, dict):
-            return arguments, None
+        if not self._server_path.exists():
+            raise RuntimeError(f"Server script not found: {self._server_path}")
 
-        if isinstance(arguments, str):
-            text = arguments.strip()
-            if not text:
-                return {}, None
-            try:
-                parsed = json.loads(text)
-            except json.JSONDecodeError as exc:
-                return None, f"'arguments' JSON is invalid: {exc.msg}"
-            if not isinstance(parsed, dict):
-                return None, "'arguments' JSON must decode to an object"
-            return parsed, None
+        # Popen returns right after exec, so the workers boot in parallel.
+        try:
+            for _ in range(self._pool_size):
+                self._procs.append(self._spawn())
+        except RuntimeError:
+            self.close()
+            raise
 
-        return None, "'arguments' must be a dictionary, JSON string, or None"
+        for idx in range(len(self._procs)):
+            self._idle.put(idx)
 
     def request(self, tool: str, arguments: dict | str | None = None) -> dict:
         """Send one tool request and return one response dictionary.
@@ -85,43 +134,115 @@ class MCPClient:
         if not isinstance(tool, str) or not tool:
             return {"status": "error", "error": "'tool' must be a non-empty string"}
 
-        arguments, arg_error = self._normalize_arguments(arguments)
+        raw_arguments = arguments.strip().encode("utf-8") if isinstance(arguments, str) else b""
+        arguments, arg_error = _normalize_arguments(arguments)
         if arg_error is not None:
             return {"status": "error", "error": arg_error}
 
-        if self._proc is None or self._proc.poll() is not None:
-            return {"status": "error", "error": "Server is not running. Call start() first."}
-
-        request_payload = {"tool": tool, "arguments": arguments}
         try:
-            request_line = json.dumps(request_payload)
+            if raw_arguments and b"\n" not in raw_arguments:
+                # The model's JSON text just parsed as exactly one object, so it can be
+                # spliced into the envelope as-is instead of being re-encoded. Text with
+                # raw newlines would break line framing and takes the encode path.
+                request_line = _envelope_prefix(tool) + raw_arguments + b"}"
+            else:
+                request_line = json_codec.dumps_bytes({"tool": tool, "arguments": arguments})
         except TypeError as exc:
             return {"status": "error", "error": f"Request is not JSON-serializable: {exc}"}
 
-        assert self._proc.stdin is not None
-        assert self._proc.stdout is not None
+        return self._send(request_line)
 
+    def request_many(self, calls: list[tuple[str, dict | str | None]]) -> list[dict]:
+        """Send several tool requests in one round trip; return one response per call.
+
+        Calls run in order on a single server worker (see the `__batch__` tool in
+        mcp_server.py). Calls that fail local validation get their error response
+        without being sent; a transport error is repeated for every sent call.
+        """
+        responses: list[dict | None] = [None] * len(calls)
+        batch: list[dict] = []
+        batch_slots: list[int] = []
+        for slot, (tool, arguments) in enumerate(calls):
+            if not isinstance(tool, str) or not tool:
+                responses[slot] = {"status": "error", "error": "'tool' must be a non-empty string"}
+                continue
+            arguments, arg_error = _normalize_arguments(arguments)
+            if arg_error is not None:
+                responses[slot] = {"status": "error", "error": arg_error}
+                continue
+            batch.append({"tool": tool, "arguments": arguments})
+            batch_slots.append(slot)
+
+        if batch:
+            try:
+                batch_payload = {"tool": "__batch__", "arguments": {"calls": batch}}
+                request_line = json_codec.dumps_bytes(batch_payload)
+            except TypeError as exc:
+                batch_response = {"status": "error", "error": f"Request is not JSON-serializable: {exc}"}
+            else:
+                batch_response = self._send(request_line)
+
+            results = batch_response.get("result")
+            batch_ok = batch_response.get("status") == "ok"
+            if batch_ok and isinstance(results, list) and len(results) == len(batch):
+                for slot, result in zip(batch_slots, results):
+                    if not isinstance(result, dict) or "status" not in result:
+                        result = {"status": "error", "error": "Server returned a malformed batch entry"}
+                    responses[slot] = result
+            else:
+                if batch_ok:
+                    batch_response = {"status": "error", "error": "Server returned a malformed batch response"}
+                for slot in batch_slots:
+                    responses[slot] = batch_response
+
+        return responses
+
+    def _send(self, request_line: bytes) -> dict:
+        """Send one encoded request line on an idle worker and return its response."""
+        if not self._procs:
+            return {"status": "error", "error": "Server is not running. Call start() first."}
+
+        idx = self._idle.get()
+        try:
+            proc = self._procs[idx]
+            if proc.poll() is not None:
+                # A long-lived client outlives crashed workers; replace this one in place.
+                try:
+                    proc = self._procs[idx] = self._spawn()
+                except RuntimeError as exc:
+                    return {"status": "error", "error": str(exc)}
+            return self._request_on(proc, request_line)
+        finally:
+            self._idle.put(idx)
+
+    def _request_on(self, proc: subprocess.Popen[bytes], request_line: bytes) -> dict:
+        """Run one request/response round-trip on a worker the caller owns.
+
+        `_spawn` always opens stdin/stdout as pipes, so both streams are present.
+        """
+        stdin, stdout = proc.stdin, proc.stdout
         try:
-            self._proc.stdin.write(request_line + "\n")
-            self._proc.stdin.flush()
+            stdin.write(request_line + b"\n")
+            stdin.flush()
         except OSError as exc:
             return {"status": "error", "error": f"Failed to write to server stdin: {exc}"}
 
-        response_line = self._proc.stdout.readline()
+        response_line = stdout.readline()
+
         if not response_line:
             stderr_text = ""
-            if self._proc.stderr is not None:
-                stderr_text = self._proc.stderr.read().strip()
+            if proc.stderr is not None:
+                stderr_text = proc.stderr.read().decode("utf-8", errors="replace").strip()
             detail = stderr_text or "No response from server."
             return {"status": "error", "error": f"Server disconnected: {detail}"}
 
         try:
-            response_payload = json.loads(response_line)
-        except json.JSONDecodeError:
+            response_payload = json_codec.loads(response_line)
+        except json_codec.JSONDecodeError:
             return {
                 "status": "error",
                 "error": "Server returned invalid JSON response",
-                "raw_response": response_line.strip(),
+                "raw_response": response_line.decode("utf-8", errors="replace").strip(),
             }
 
         if not isinstance(response_payload, dict):
@@ -136,26 +257,34 @@ class MCPClient:
 
         return response_payload
 
-    def close(self) -> None:
-        """Stop the server subprocess gracefully."""
-        if self._proc is None:
-            return
+    async def request_async(self, tool: str, arguments: dict | str | None = None) -> dict:
+        """Awaitable variant of `request` for callers that fan out tool calls.
 
-        try:
-            if self._proc.stdin is not None:
-                self._proc.stdin.close()
-        except OSError:
-            pass
+        The round-trip stays blocking and runs in a worker thread; each call
+        borrows its own idle server process, so calls overlap up to `pool_size`.
+        """
+        return await asyncio.to_thread(self.request, tool, arguments)
 
-        if self._proc.poll() is None:
-            self._proc.terminate()
+    def close(self) -> None:
+        """Stop every server subprocess gracefully."""
+        for proc in self._procs:
             try:
-                self._proc.wait(timeout=2)
-            except subprocess.TimeoutExpired:
-                self._proc.kill()
-                self._proc.wait(timeout=2)
-
-        self._proc = None
+                if proc.stdin is not None:
+                    proc.stdin.close()
+            except OSError:
+                pass
+
+        for proc in self._procs:
+            if proc.poll() is None:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                    proc.wait(timeout=2)
+
+        self._procs = []
+        self._idle = queue.SimpleQueue()
 
     def __enter__(self) -> MCPClient:
         """Context-manager entry: start server automatically."""
@@ -167,6 +296,56 @@ class MCPClient:
         self.close()
 
 
+class InProcessMCPClient:
+    """Drop-in `MCPClient` replacement that dispatches tool requests in-process."""
+
+    def __init__(self) -> None:
+        self._dispatch = None
+
+    def start(self) -> None:
+        """Load the server's dispatch function (imports storage on first use)."""
+        if self._dispatch is None:
+            from mcp_server import dispatch
+
+            self._dispatch = dispatch
+
+    def request(self, tool: str, arguments: dict | str | None = None) -> dict:
+        """Run one tool request and return one response dictionary."""
+        if not isinstance(tool, str) or not tool:
+            return {"status": "error", "error": "'tool' must be a non-empty string"}
+
+        arguments, arg_error = _normalize_arguments(arguments)
+        if arg_error is not None:
+            return {"status": "error", "error": arg_error}
+
+        if self._dispatch is None:
+            return {"status": "error", "error": "Server is not running. Call start() first."}
+
+        return self._dispatch(tool, arguments)
+
+    def request_many(self, calls: list[tuple[str, dict | str | None]]) -> list[dict]:
+        """Run several tool requests in order, matching `MCPClient.request_many`."""
+        # No transport round trip to save in-process, so plain sequential requests suffice.
+        return [self.request(tool, arguments) for tool, arguments in calls]
+
+    async def request_async(self, tool: str, arguments: dict | str | None = None) -> dict:
+        """Awaitable variant of `request`, matching `MCPClient.request_async`."""
+        return await asyncio.to_thread(self.request, tool, arguments)
+
+    def close(self) -> None:
+        """Forget the dispatch function; there is no process to stop."""
+        self._dispatch = None
+
+    def __enter__(self) -> InProcessMCPClient:
+        """Context-manager entry: start client automatically."""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Context-manager exit: always stop client."""
+        self.close()
+
+
 if __name__ == "__main__":
     # Minimal demonstration call for manual local testing.
     with MCPClient() as client:
@@ -20,28 +20,25 @@ On errors, this server returns:
   "status": "error",
   "error": "..."
 }
+
+Batch requests run several calls in order within one round trip:
+{
+  "tool": "__batch__",
+  "arguments": {"calls": [{"tool": "...", "arguments": { ... }}, ...]}
+}
+The response is `{"status": "ok", "result": [<one response per call>, ...]}`.
 """
 
 from __future__ import annotations
 
-import io
-import json
 import sys
-from contextlib import redirect_stdout
 
+import json_codec
 from storage import add_task, delete_task, delete_tasks, list_tasks, mark_done
 
 
-def _capture_storage_output(func, *args) -> str:
-    """Run a storage function and capture any printed output as a result string."""
-    buffer = io.StringIO()
-    with redirect_stdout(buffer):
-        func(*args)
-    return buffer.getvalue().strip() or "OK"
-
-
 def _dispatch_tool(tool: str, arguments: dict) -> str:
-    """Dispatch tool requests to storage.py functions.
+    """Dispatch tool requests to storage.py functions and return their result text.
 
     Tool dispatch is centralized here to keep behavior deterministic and explicit.
     """
@@ -49,24 +46,24 @@ def _dispatch_tool(tool: str, arguments: dict) -> str:
         text = arguments.get("text")
         if not isinstance(text, str) or not text.strip():
             raise ValueError("'add_task' requires a non-empty string argument: text")
-        return _capture_storage_output(add_task, text)
+        return add_task(text)
 
     if tool == "list_tasks":
         if arguments:
             raise ValueError("'list_tasks' does not accept arguments")
-        return _capture_storage_output(list_tasks)
+        return list_tasks()
 
     if tool == "complete_task":
         task_id = arguments.get("task_id")
         if not isinstance(task_id, int):
             raise ValueError("'complete_task' requires integer argument: task_id")
-        return _capture_storage_output(mark_done, task_id)
+        return mark_done(task_id)
 
     if tool == "delete_task":
         task_id = arguments.get("task_id")
         if not isinstance(task_id, int):
             raise ValueError("'delete_task' requires integer argument: task_id")
-        return _capture_storage_output(delete_task, task_id)
+        return delete_task(task_id)
 
     if tool == "delete_tasks":
         task_ids = arguments.get("task_ids")
@@ -74,33 +71,46 @@ def _dispatch_tool(tool: str, arguments: dict) -> str:
             raise ValueError("'delete_tasks' requires non-empty array argument: task_ids")
         if not all(isinstance(task_id, int) for task_id in task_ids):
             raise ValueError("'delete_tasks' requires all task_ids to be integers")
-        return _capture_storage_output(delete_tasks, task_ids)
+        return delete_tasks(task_ids)
 
     raise ValueError(f"Unsupported tool: {tool}")
 
 
-def handle_request(raw_line: str) -> dict:
-    """Parse one request line and return a deterministic response dictionary.
+BATCH_TOOL = "__batch__"
 
-    Keeping this logic separate from I/O makes behavior easier to test.
-    """
-    try:
-        payload = json.loads(raw_line)
-    except json.JSONDecodeError as exc:
-        return {"status": "error", "error": f"Invalid JSON: {exc.msg}"}
 
-    if not isinstance(payload, dict):
-        return {"status": "error", "error": "Request must be a JSON object"}
+def _dispatch_batch(arguments: dict) -> dict:
+    """Run every call of a batch request in order and collect one response each."""
+    calls = arguments.get("calls")
+    if not isinstance(calls, list):
+        return {"status": "error", "error": f"'{BATCH_TOOL}' requires array argument: calls"}
+
+    responses = []
+    for call in calls:
+        if not isinstance(call, dict):
+            responses.append({"status": "error", "error": "Each batch call must be a JSON object"})
+        elif call.get("tool") == BATCH_TOOL:
+            responses.append({"status": "error", "error": f"'{BATCH_TOOL}' calls cannot be nested"})
+        else:
+            responses.append(dispatch(call.get("tool"), call.get("arguments", {})))
+    return {"status": "ok", "result": responses}
+
 
-    tool = payload.get("tool")
-    arguments = payload.get("arguments", {})
+def dispatch(tool: str, arguments: dict) -> dict:
+    """Run one already-decoded request and return its response dictionary.
 
+    This is the transport-free core of the server: `handle_request` calls it after
+    parsing a line, and in-process clients call it directly.
+    """
     if not isinstance(tool, str) or not tool:
         return {"status": "error", "error": "Missing or invalid 'tool' field"}
 
     if not isinstance(arguments, dict):
         return {"status": "error", "error": "'arguments' must be a JSON object"}
 
+    if tool == BATCH_TOOL:
+        return _dispatch_batch(arguments)
+
     try:
         result = _dispatch_tool(tool, arguments)
     except Exception as exc:
@@ -109,6 +119,22 @@ def handle_request(raw_line: str) -> dict:
     return {"status": "ok", "result": result}
 
 
+def handle_request(raw_line: str | bytes) -> dict:
+    """Parse one request line and return a deterministic response dictionary.
+
+    Keeping this logic separate from I/O makes behavior easier to test.
+    """
+    try:
+        payload = json_codec.loads(raw_line)
+    except json_codec.JSONDecodeError as exc:
+        return {"status": "error", "error": f"Invalid JSON: {exc.msg}"}
+
+    if not isinstance(payload, dict):
+        return {"status": "error", "error": "Request must be a JSON object"}
+
+    return dispatch(payload.get("tool"), payload.get("arguments", {}))
+
+
 def main() -> None:
     """Run the server loop.
 
@@ -118,15 +144,18 @@ def main() -> None:
     - storage.py owns the task business logic and JSON persistence.
     This separation keeps each layer simpler and independently reusable.
     """
-    for line in sys.stdin:
+    # Binary pipes: requests are decoded and responses encoded straight from/to
+    # UTF-8 bytes, with no text-layer newline translation in between.
+    stdout = sys.stdout.buffer
+    for line in sys.stdin.buffer:
         line = line.strip()
         if not line:
             # Ignore empty lines to keep line-oriented protocol simple.
             continue
 
         response = handle_request(line)
-        sys.stdout.write(json.dumps(response) + "\n")
-        sys.stdout.flush()
+        stdout.write(json_codec.dumps_bytes(response) + b"\n")
+        stdout.flush()
 
 
 if __name__ == "__main__":
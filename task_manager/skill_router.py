@@ -1,7 +1,8 @@
 """Model-assisted skill router with deterministic validation.
 
 This module is intentionally small and pure:
-- Standard library only (`json`, `typing`).
+- Standard library only (`re`, `typing`), plus the in-repo `json_codec`, which
+  uses `orjson` when it is installed and `json` otherwise.
 - No OpenAI SDK import.
 - No side effects.
 
@@ -10,12 +11,18 @@ Safety and debuggability design:
 - Output is validated with deterministic checks.
 - Retries are bounded by `max_attempts`.
 - Failures return explicit reasons instead of silent fallback behavior.
+- `call_model_fn` may return text chunks as they stream; output that cannot be a
+  JSON object is rejected at its first character and the stream is closed.
+- `on_valid_output`, if given, receives `(messages, raw_output)` only for output
+  that passed validation, so callers can cache responses without storing bad ones.
 """
 
 from __future__ import annotations
 
-import json
-from typing import Callable
+import re
+from typing import Callable, Iterable
+
+import json_codec
 
 # Allowed skills and their routing descriptions.
 # Keys are the only valid enum values the model may return.
@@ -27,86 +34,215 @@ ALLOWED_SKILLS: dict[str, str] = {
     "output_format": "Use when the goal asks for a specific response format.",
 }
 
+# Deterministic keyword rules for optional skills, mirroring ALLOWED_SKILLS descriptions.
+# Used by the opt-in local router; a goal that matches no rule is left to the model.
+_LOCAL_SKILL_RULES: tuple[tuple[str, re.Pattern[str]], ...] = (
+    (
+        "task_planning",
+        re.compile(r"\b(?:plan|planning|organi[sz]e|sequence|prioriti[sz]e|schedule|break\s+down)\b", re.IGNORECASE),
+    ),
+    (
+        "task_deletion",
+        re.compile(r"\b(?:delete|remove|purge|clear|clean\s+up)\b", re.IGNORECASE),
+    ),
+    (
+        "status_reporting",
+        re.compile(r"\b(?:status|progress|report|summary|summari[sz]e|how\s+many)\b", re.IGNORECASE),
+    ),
+    (
+        "output_format",
+        re.compile(r"\b(?:format|table|bullets?|json|markdown|csv|columns?)\b", re.IGNORECASE),
+    ),
+)
+
+
+# Prompt text that does not depend on the goal is assembled once at import and
+# sent as its own system message; only the user message (goal plus optional retry
+# block) changes between goals and attempts, so provider prompt caching can reuse
+# the static prefix.
+_SKILLS_BLOCK = "\n".join(
+    f'- "{skill_name}": {skill_description}' for skill_name, skill_description in ALLOWED_SKILLS.items()
+)
+
+_ROUTING_PROMPT_HEAD = (
+    "You are a strict skill router.\n"
+    "Select the minimal set of skills needed for the goal.\n"
+    "Output must be valid JSON only with this exact object shape:\n"
+    '{\"skills\": [\"<allowed_skill>\", ...], \"reason\": \"<short reason>\"}\n'
+    "Rules:\n"
+    "- Do not include keys other than skills and reason.\n"
+    "- skills must be an array of unique strings.\n"
+    "- Every skills value must be one of the allowed enum values.\n"
+    "- Do not return markdown, prose, or code fences.\n"
+    "- Keep reason concise.\n"
+    "Allowed skill enum values:\n"
+    f"{_SKILLS_BLOCK}\n"
+)
+
+_INTENT_PROMPT_HEAD = (
+    "You are a strict goal intent classifier.\n"
+    "Classify whether the goal asks to add tasks and/or delete tasks.\n"
+    "Output must be valid JSON only with this exact object shape:\n"
+    '{"wants_add": true|false, "wants_delete": true|false, "reason": "<short reason>"}\n'
+    "Rules:\n"
+    "- Do not include keys other than wants_add, wants_delete, and reason.\n"
+    "- wants_add must be a boolean.\n"
+    "- wants_delete must be a boolean.\n"
+    "- reason must be a short string.\n"
+    "- Do not return markdown, prose, or code fences.\n"
+)
+
+_COMBINED_PROMPT_HEAD = (
+    "You are a strict skill router and goal intent classifier.\n"
+    "Select the minimal set of skills needed for the goal, and classify whether "
+    "the goal asks to add tasks and/or delete tasks.\n"
+    "Output must be valid JSON only with this exact object shape:\n"
+    '{"skills": ["<allowed_skill>", ...], "wants_add": true|false, '
+    '"wants_delete": true|false, "reason": "<short reason>"}\n'
+    "Rules:\n"
+    "- Do not include keys other than skills, wants_add, wants_delete, and reason.\n"
+    "- skills must be an array of unique strings.\n"
+    "- Every skills value must be one of the allowed enum values.\n"
+    "- wants_add must be a boolean.\n"
+    "- wants_delete must be a boolean.\n"
+    "- Do not return markdown, prose, or code fences.\n"
+    "- Keep reason concise.\n"
+    "Allowed skill enum values:\n"
+    f"{_SKILLS_BLOCK}\n"
+)
+
+
+# Exact key sets each router output must have; dict_keys compares to a frozenset
+# directly, so validation builds no temporary sets.
+_ROUTER_KEYS = frozenset({"skills", "reason"})
+_INTENT_KEYS = frozenset({"wants_add", "wants_delete", "reason"})
+_COMBINED_KEYS = frozenset({"skills", "wants_add", "wants_delete", "reason"})
+
+
+def _build_retry_block(validation_error: str | None) -> str:
+    """Return the retry instructions appended after a failed validation, if any."""
+    if not validation_error:
+        return ""
+    return (
+        "\nPrevious response failed validation.\n"
+        f"Validation error: {validation_error}\n"
+        "Return corrected JSON only.\n"
+    )
 
-def _build_routing_prompt(goal: str, validation_error: str | None = None) -> str:
-    """Build the routing prompt with fixed schema and allowed enum values."""
-    skill_lines = []
-    for skill_name, skill_description in ALLOWED_SKILLS.items():
-        skill_lines.append(f'- "{skill_name}": {skill_description}')
-    skills_block = "\n".join(skill_lines)
 
-    retry_block = ""
-    if validation_error:
-        retry_block = (
-            "\nPrevious response failed validation.\n"
-            f"Validation error: {validation_error}\n"
-            "Return corrected JSON only.\n"
-        )
+def _build_messages(prompt_head: str, goal: str, validation_error: str | None) -> list[dict]:
+    """Return chat messages: the static rules first, then the goal and retry block."""
+    return [
+        {"role": "system", "content": prompt_head},
+        {"role": "user", "content": f"Goal:\n{goal}\n{_build_retry_block(validation_error)}"},
+    ]
 
-    return (
-        "You are a strict skill router.\n"
-        "Select the minimal set of skills needed for the goal.\n"
-        "Output must be valid JSON only with this exact object shape:\n"
-        '{\"skills\": [\"<allowed_skill>\", ...], \"reason\": \"<short reason>\"}\n'
-        "Rules:\n"
-        "- Do not include keys other than skills and reason.\n"
-        "- skills must be an array of unique strings.\n"
-        "- Every skills value must be one of the allowed enum values.\n"
-        "- Do not return markdown, prose, or code fences.\n"
-        "- Keep reason concise.\n"
-        "Allowed skill enum values:\n"
-        f"{skills_block}\n"
-        f"Goal:\n{goal}\n"
-        f"{retry_block}"
-    )
 
+def _build_routing_messages(goal: str, validation_error: str | None = None) -> list[dict]:
+    """Build the routing messages with fixed schema and allowed enum values."""
+    return _build_messages(_ROUTING_PROMPT_HEAD, goal, validation_error)
 
-def _build_intent_prompt(goal: str, validation_error: str | None = None) -> str:
-    """Build prompt for add/delete goal-intent classification."""
-    retry_block = ""
-    if validation_error:
-        retry_block = (
-            "\nPrevious response failed validation.\n"
-            f"Validation error: {validation_error}\n"
-            "Return corrected JSON only.\n"
-        )
 
-    return (
-        "You are a strict goal intent classifier.\n"
-        "Classify whether the goal asks to add tasks and/or delete tasks.\n"
-        "Output must be valid JSON only with this exact object shape:\n"
-        '{"wants_add": true|false, "wants_delete": true|false, "reason": "<short reason>"}\n'
-        "Rules:\n"
-        "- Do not include keys other than wants_add, wants_delete, and reason.\n"
-        "- wants_add must be a boolean.\n"
-        "- wants_delete must be a boolean.\n"
-        "- reason must be a short string.\n"
-        "- Do not return markdown, prose, or code fences.\n"
-        f"Goal:\n{goal}\n"
-        f"{retry_block}"
-    )
+def _build_intent_messages(goal: str, validation_error: str | None = None) -> list[dict]:
+    """Build messages for add/delete goal-intent classification."""
+    return _build_messages(_INTENT_PROMPT_HEAD, goal, validation_error)
+
+
+def _build_combined_messages(goal: str, validation_error: str | None = None) -> list[dict]:
+    """Build messages that route skills and classify add/delete intent together."""
+    return _build_messages(_COMBINED_PROMPT_HEAD, goal, validation_error)
+
+
+def _validate_skills_list(skills: object) -> str | None:
+    """Return an error message when `skills` is not a valid skill list, else None."""
+    if not isinstance(skills, list):
+        return "skills must be a JSON array."
+
+    # One pass: type and duplicate errors stop immediately; unknown names are all
+    # collected so the retry prompt can list every one of them.
+    seen: set[str] = set()
+    unknown: list[str] = []
+    for item in skills:
+        if not isinstance(item, str):
+            return "skills must contain only strings."
+        if item in seen:
+            return "skills must not contain duplicates."
+        seen.add(item)
+        if item not in ALLOWED_SKILLS:
+            unknown.append(item)
+
+    if unknown:
+        return f"Unknown skills: {unknown}."
+
+    return None
+
+
+def _read_model_output(output: str | Iterable[str]) -> tuple[str, str | None]:
+    """Return `(text, early_error)` for a model reply given whole or as streamed chunks.
+
+    Every valid reply is a JSON object, possibly inside a markdown code fence, so a
+    stream whose first non-whitespace character is neither `{` nor a backtick
+    (i.e. prose) is closed without reading the rest.
+    """
+    if isinstance(output, str):
+        return output, None
+
+    parts: list[str] = []
+    started = False
+    try:
+        for chunk in output:
+            parts.append(chunk)
+            if started:
+                continue
+            head = chunk.lstrip()
+            if not head:
+                continue
+            started = True
+            if head[0] not in "{`":
+                return "".join(parts), "Output is not a JSON object; return JSON only, with no prose or code fences."
+    finally:
+        close = getattr(output, "close", None)
+        if close is not None:
+            close()
+    return "".join(parts), None
+
+
+def _strip_fences(raw_output: str) -> str:
+    """Return the body of a ```/```json fenced reply, or the text unchanged.
+
+    Models sometimes fence JSON despite the prompt; unwrapping it here saves a
+    full retry round trip. Plain string checks keep the common unfenced case cheap.
+    """
+    text = raw_output.strip()
+    if not text.startswith("```"):
+        return raw_output
+    body_start = text.find("\n")
+    if body_start == -1:
+        return raw_output
+    body_end = text.rfind("```")
+    if body_end <= body_start:
+        return text[body_start + 1:]
+    return text[body_start + 1:body_end]
 
 
 def _validate_router_output(raw_output: str) -> tuple[bool, list[str], str]:
     """Validate model output with strict deterministic checks.
 
     Rejects:
-    - non-JSON output
+    - non-JSON output (a surrounding markdown code fence is tolerated)
     - wrong keys
     - unknown skills
     - duplicate skills
     """
     try:
-        parsed = json.loads(raw_output)
-    except json.JSONDecodeError:
+        parsed = json_codec.loads(_strip_fences(raw_output))
+    except json_codec.JSONDecodeError:
         return False, [], "Output is not valid JSON."
 
     if not isinstance(parsed, dict):
         return False, [], "JSON root must be an object."
 
-    allowed_keys = {"skills", "reason"}
-    actual_keys = set(parsed.keys())
-    if actual_keys != allowed_keys:
+    if parsed.keys() != _ROUTER_KEYS:
         return (
             False,
             [],
@@ -116,18 +252,9 @@ def _validate_router_output(raw_output: str) -> tuple[bool, list[str], str]:
     skills = parsed.get("skills")
     reason = parsed.get("reason")
 
-    if not isinstance(skills, list):
-        return False, [], "skills must be a JSON array."
-
-    if not all(isinstance(item, str) for item in skills):
-        return False, [], "skills must contain only strings."
-
-    if len(skills) != len(set(skills)):
-        return False, [], "skills must not contain duplicates."
-
-    unknown = [item for item in skills if item not in ALLOWED_SKILLS]
-    if unknown:
-        return False, [], f"Unknown skills: {unknown}."
+    skills_error = _validate_skills_list(skills)
+    if skills_error is not None:
+        return False, [], skills_error
 
     if not isinstance(reason, str):
         return False, [], "reason must be a string."
@@ -138,16 +265,14 @@ def _validate_router_output(raw_output: str) -> tuple[bool, list[str], str]:
 def _validate_intent_output(raw_output: str) -> tuple[bool, dict[str, bool], str]:
     """Validate model output for add/delete intent classification."""
     try:
-        parsed = json.loads(raw_output)
-    except json.JSONDecodeError:
+        parsed = json_codec.loads(_strip_fences(raw_output))
+    except json_codec.JSONDecodeError:
         return False, {}, "Output is not valid JSON."
 
     if not isinstance(parsed, dict):
         return False, {}, "JSON root must be an object."
 
-    allowed_keys = {"wants_add", "wants_delete", "reason"}
-    actual_keys = set(parsed.keys())
-    if actual_keys != allowed_keys:
+    if parsed.keys() != _INTENT_KEYS:
         return (
             False,
             {},
@@ -170,17 +295,75 @@ def _validate_intent_output(raw_output: str) -> tuple[bool, dict[str, bool], str
     return True, {"wants_add": wants_add, "wants_delete": wants_delete}, reason
 
 
+def _validate_combined_output(raw_output: str) -> tuple[bool, list[str], dict[str, bool], str]:
+    """Validate combined skill + intent router output with the same strict rules."""
+    try:
+        parsed = json_codec.loads(_strip_fences(raw_output))
+    except json_codec.JSONDecodeError:
+        return False, [], {}, "Output is not valid JSON."
+
+    if not isinstance(parsed, dict):
+        return False, [], {}, "JSON root must be an object."
+
+    if parsed.keys() != _COMBINED_KEYS:
+        return (
+            False,
+            [],
+            {},
+            "JSON keys must be exactly ['skills', 'wants_add', 'wants_delete', 'reason'] with no extras.",
+        )
+
+    skills = parsed.get("skills")
+    wants_add = parsed.get("wants_add")
+    wants_delete = parsed.get("wants_delete")
+    reason = parsed.get("reason")
+
+    skills_error = _validate_skills_list(skills)
+    if skills_error is not None:
+        return False, [], {}, skills_error
+
+    if not isinstance(wants_add, bool):
+        return False, [], {}, "wants_add must be a boolean."
+
+    if not isinstance(wants_delete, bool):
+        return False, [], {}, "wants_delete must be a boolean."
+
+    if not isinstance(reason, str):
+        return False, [], {}, "reason must be a string."
+
+    return True, skills, {"wants_add": wants_add, "wants_delete": wants_delete}, reason
+
+
+def route_skills_locally(goal: str) -> tuple[bool, list[str], str]:
+    """Route skills with keyword rules only, without a model call.
+
+    Returns:
+    - (True, skills, reason) when at least one rule matched.
+    - (False, [], reason) when no rule matched, so callers can defer to the model.
+    """
+    if not isinstance(goal, str) or not goal.strip():
+        return False, [], "Goal must be a non-empty string."
+
+    skills = [skill_name for skill_name, pattern in _LOCAL_SKILL_RULES if pattern.search(goal)]
+    if not skills:
+        return False, [], "No local routing rule matched."
+    return True, skills, f"Matched keyword rules: {skills}."
+
+
 def route_skills_with_model(
     goal: str,
-    call_model_fn: Callable[[str], str],
+    call_model_fn: Callable[[list[dict]], str | Iterable[str]],
     max_attempts: int,
+    on_valid_output: Callable[[list[dict], str], None] | None = None,
 ) -> tuple[bool, list[str], str]:
     """Route skills with bounded retries and deterministic validation.
 
     Parameters:
     - goal: user goal text to route.
-    - call_model_fn: function that takes a prompt string and returns model text.
+    - call_model_fn: function that takes chat messages and returns model text,
+      either whole or as an iterable of streamed text chunks.
     - max_attempts: hard retry cap.
+    - on_valid_output: optional callback for each validated `(messages, raw_output)`.
 
     Returns:
     - (True, skills, reason) on success.
@@ -193,15 +376,20 @@ def route_skills_with_model(
 
     last_error = "No attempts were made."
     for _ in range(max_attempts):
-        prompt = _build_routing_prompt(goal=goal, validation_error=last_error)
+        messages = _build_routing_messages(goal=goal, validation_error=last_error)
         try:
-            raw_output = call_model_fn(prompt)
+            raw_output, early_error = _read_model_output(call_model_fn(messages))
         except Exception as exc:  # pragma: no cover - defensive guard
             last_error = f"Model call failed: {exc}"
             continue
+        if early_error is not None:
+            last_error = early_error
+            continue
 
         ok, skills, reason = _validate_router_output(raw_output)
         if ok:
+            if on_valid_output is not None:
+                on_valid_output(messages, raw_output)
             return True, skills, reason
 
         last_error = reason
@@ -211,8 +399,9 @@ def route_skills_with_model(
 
 def route_goal_intent_with_model(
     goal: str,
-    call_model_fn: Callable[[str], str],
+    call_model_fn: Callable[[list[dict]], str | Iterable[str]],
     max_attempts: int,
+    on_valid_output: Callable[[list[dict], str], None] | None = None,
 ) -> tuple[bool, dict[str, bool], str]:
     """Route add/delete intent with bounded retries and deterministic validation."""
     if not isinstance(goal, str) or not goal.strip():
@@ -222,15 +411,20 @@ def route_goal_intent_with_model(
 
     last_error = "No attempts were made."
     for _ in range(max_attempts):
-        prompt = _build_intent_prompt(goal=goal, validation_error=last_error)
+        messages = _build_intent_messages(goal=goal, validation_error=last_error)
         try:
-            raw_output = call_model_fn(prompt)
+            raw_output, early_error = _read_model_output(call_model_fn(messages))
         except Exception as exc:  # pragma: no cover - defensive guard
             last_error = f"Model call failed: {exc}"
             continue
+        if early_error is not None:
+            last_error = early_error
+            continue
 
         ok, intent, reason = _validate_intent_output(raw_output)
         if ok:
+            if on_valid_output is not None:
+                on_valid_output(messages, raw_output)
             return True, intent, reason
 
         last_error = reason
@@ -238,4 +432,50 @@ def route_goal_intent_with_model(
     return False, {}, f"Intent routing failed after {max_attempts} attempt(s): {last_error}"
 
 
-__all__ = ["ALLOWED_SKILLS", "route_goal_intent_with_model", "route_skills_with_model"]
+def route_combined_with_model(
+    goal: str,
+    call_model_fn: Callable[[list[dict]], str | Iterable[str]],
+    max_attempts: int,
+    on_valid_output: Callable[[list[dict], str], None] | None = None,
+) -> tuple[bool, list[str], dict[str, bool], str]:
+    """Route skills and add/delete intent in one model call per attempt.
+
+    Returns:
+    - (True, skills, intent, reason) on success.
+    - (False, [], {}, failure_reason) when attempts are exhausted.
+    """
+    if not isinstance(goal, str) or not goal.strip():
+        return False, [], {}, "Goal must be a non-empty string."
+    if max_attempts < 1:
+        return False, [], {}, "max_attempts must be at least 1."
+
+    last_error = "No attempts were made."
+    for _ in range(max_attempts):
+        messages = _build_combined_messages(goal=goal, validation_error=last_error)
+        try:
+            raw_output, early_error = _read_model_output(call_model_fn(messages))
+        except Exception as exc:  # pragma: no cover - defensive guard
+            last_error = f"Model call failed: {exc}"
+            continue
+        if early_error is not None:
+            last_error = early_error
+            continue
+
+        ok, skills, intent, reason = _validate_combined_output(raw_output)
+        if ok:
+            if on_valid_output is not None:
+                on_valid_output(messages, raw_output)
+            return True, skills, intent, reason
+
+        last_error = reason
+
+    return False, [], {}, f"Combined routing failed after {max_attempts} attempt(s): {last_error}"
+
+
+__all__ = [
+    "ALLOWED_SKILLS",
+    "route_combined_with_model",
+    "route_goal_intent_with_model",
+    "route_skills_locally",
+    "route_skills_with_model",
+]
@@ -1,113 +1,320 @@
-"""Task persistence and basic operations using a local JSON file."""
+"""Task persistence and basic operations using a local JSON file.
+
+Persistence layout:
+- `tasks.json` is a snapshot of the full task list.
+- `tasks.log` records mutations made since that snapshot, one JSON object per line,
+  so a mutation appends one short line instead of rewriting every task.
+- Loading replays the log over the snapshot. Once the log grows past
+  LOG_COMPACT_BYTES, the next mutation folds it into a fresh snapshot.
+"""
 
 from __future__ import annotations
 
-import json
+import codecs
+from dataclasses import dataclass
+from json.encoder import encode_basestring
+import os
 from pathlib import Path
 
+import json_codec
+
 # Store tasks in tasks.json next to this module for simple cross-platform behavior.
 TASKS_FILE = Path(__file__).with_name("tasks.json")
 
+# Fold the operation log into the snapshot once it grows past this many bytes.
+LOG_COMPACT_BYTES = 64 * 1024
 
-# Read tasks from disk, tolerating a missing or empty file.
-def load_tasks() -> list[dict]:
-    """Load tasks from tasks.json; return an empty list if file is missing or empty."""
-    if not TASKS_FILE.exists():
+# Every task the tools create has exactly these keys.
+_TASK_KEYS = frozenset({"id", "title", "done"})
+
+
+@dataclass(slots=True)
+class _TaskCache:
+    """Last loaded task list plus state derived from it, valid while `signature` matches disk."""
+
+    signature: tuple
+    tasks: list[dict]
+    # Highest id in `tasks` (0 when empty), so next_id needs no scan.
+    max_id: int
+    # The same task dicts as `tasks`, keyed by id for constant-time lookups.
+    by_id: dict[int, dict]
+
+    @classmethod
+    def build(cls, signature: tuple, tasks: list[dict]) -> _TaskCache:
+        """Derive max_id and the id index from a freshly loaded or saved list."""
+        by_id = {task["id"]: task for task in tasks}
+        return cls(signature, tasks, max(by_id, default=0), by_id)
+
+
+# Several processes (CLI, MCP server workers) share the files, so every load
+# re-checks the stat signature instead of trusting the cache blindly.
+_TASKS_CACHE: _TaskCache | None = None
+
+
+def _log_file() -> Path:
+    """Return the operation log path; derived from TASKS_FILE so both always move together."""
+    return TASKS_FILE.with_suffix(".log")
+
+
+# Read the snapshot from disk, tolerating a missing or empty file.
+def _read_snapshot() -> list[dict]:
+    """Load the tasks.json snapshot; return an empty list if file is missing or empty."""
+    try:
+        content = TASKS_FILE.read_bytes()
+    except FileNotFoundError:
         return []
 
-    # Use utf-8-sig so files with a UTF-8 BOM still parse correctly on Windows.
-    with TASKS_FILE.open("r", encoding="utf-8-sig") as f:
-        content = f.read().strip()
-        if not content:
-            return []
-        return json.loads(content)
+    # Writes are atomic, but tasks.json may also be edited by hand: skip a UTF-8 BOM
+    # so files saved by Windows editors still parse correctly.
+    if content.startswith(codecs.BOM_UTF8):
+        content = content[len(codecs.BOM_UTF8):]
+    content = content.strip()
+    if not content:
+        return []
+    return json_codec.loads(content)
+
+
+# Apply logged mutations on top of the snapshot.
+def _replay_log(tasks: list[dict]) -> list[dict]:
+    """Apply every operation in tasks.log to `tasks` and return the result.
+
+    Replay is idempotent (an add whose id already exists is skipped), so a crash
+    between writing a new snapshot and removing the old log cannot duplicate tasks.
+    """
+    try:
+        content = _log_file().read_bytes()
+    except FileNotFoundError:
+        return tasks
+
+    known_ids = {task["id"] for task in tasks}
+    for line in content.splitlines():
+        if not line.strip():
+            continue
+        try:
+            op = json_codec.loads(line)
+        except json_codec.JSONDecodeError:
+            # A torn line from an interrupted append carries no complete mutation.
+            continue
+
+        kind = op.get("op")
+        if kind == "add":
+            task = op["task"]
+            if task["id"] not in known_ids:
+                tasks.append(task)
+                known_ids.add(task["id"])
+        elif kind == "done":
+            for task in tasks:
+                if task["id"] == op["id"]:
+                    task["done"] = True
+                    break
+        elif kind == "delete":
+            deleted_ids = set(op["ids"])
+            tasks = [task for task in tasks if task["id"] not in deleted_ids]
+            known_ids -= deleted_ids
+    return tasks
+
+
+def _stat_signature(path: Path) -> tuple[int, int, int] | None:
+    """Return `(mtime_ns, size, inode)` for one file, or None when it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    # Size and inode catch rewrites that a coarse filesystem mtime would hide.
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _files_signature() -> tuple:
+    """Return the combined stat signature of the snapshot and the operation log."""
+    return _stat_signature(TASKS_FILE), _stat_signature(_log_file())
+
+
+def _load_cache() -> _TaskCache:
+    """Return the cache for the current files, reloading them if either changed on disk."""
+    global _TASKS_CACHE
+    signature = _files_signature()
+    if _TASKS_CACHE is None or _TASKS_CACHE.signature != signature:
+        _TASKS_CACHE = _TaskCache.build(signature, _replay_log(_read_snapshot()))
+    return _TASKS_CACHE
+
+
+# Read tasks from disk: snapshot plus any logged mutations.
+def load_tasks() -> list[dict]:
+    """Load tasks from tasks.json and tasks.log; return an empty list if neither exists.
+
+    While neither file changes on disk, repeated loads return the cached list
+    without re-reading or re-parsing. The list is shared with the cache, so code
+    that changes it must persist the change through this module.
+    """
+    return _load_cache().tasks
+
+
+def _dump_tasks(tasks: list[dict]) -> bytes:
+    """Encode tasks as indented JSON bytes, with a fixed-schema writer on the stdlib path.
+
+    orjson is already far faster than any Python loop, so it is used whenever it is
+    installed. Without it, tasks of the exact `{id, title, done}` shape are written
+    with one format string each, matching json.dumps(indent=2, ensure_ascii=False)
+    byte for byte at a fraction of its generic type dispatch; any other shape falls
+    back to json_codec. Either way non-ASCII titles are stored as raw UTF-8, not as
+    `\\uXXXX` escapes.
+    """
+    if json_codec.orjson is not None or not tasks:
+        return json_codec.dumps_bytes(tasks, indent=True)
+
+    parts = []
+    for task in tasks:
+        task_id, title, done = task.get("id"), task.get("title"), task.get("done")
+        if (
+            task.keys() != _TASK_KEYS
+            or type(task_id) is not int
+            or type(title) is not str
+            or type(done) is not bool
+        ):
+            return json_codec.dumps_bytes(tasks, indent=True)
+        parts.append(
+            '  {\n    "id": %d,\n    "title": %s,\n    "done": %s\n  }'
+            % (task_id, encode_basestring(title), "true" if done else "false")
+        )
+    return ("[\n" + ",\n".join(parts) + "\n]").encode("utf-8")
 
 
 # Write all tasks to disk as formatted JSON.
 def save_tasks(tasks: list[dict]) -> None:
-    """Persist tasks to tasks.json with readable indentation."""
-    with TASKS_FILE.open("w", encoding="utf-8") as f:
-        json.dump(tasks, f, indent=2)
+    """Persist tasks to tasks.json with readable indentation and drop the folded log.
+
+    The snapshot is written to a temporary file and renamed over tasks.json, so
+    readers (including other MCP server workers) never see a half-written file.
+    """
+    global _TASKS_CACHE
+    # Drop the cache first: if a write fails, the next load re-reads the disk state.
+    _TASKS_CACHE = None
+    # One temp name per process, so concurrent savers never share a partial file.
+    tmp_file = TASKS_FILE.with_name(f"{TASKS_FILE.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_file.open("wb") as f:
+            f.write(_dump_tasks(tasks))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, TASKS_FILE)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    _log_file().unlink(missing_ok=True)
+    _TASKS_CACHE = _TaskCache.build(_files_signature(), tasks)
+
+
+# Persist one mutation as cheaply as the current files allow.
+def _record_mutation(op: dict, cache: _TaskCache) -> None:
+    """Append `op` to tasks.log; `cache` already holds the post-mutation state.
+
+    The first write creates tasks.json directly, and an oversized log is folded
+    into a new snapshot, so the log only ever holds a bounded tail of changes.
+    """
+    global _TASKS_CACHE
+    # Drop the cache first: if a write fails, the next load re-reads the disk state.
+    _TASKS_CACHE = None
+    if not TASKS_FILE.exists():
+        save_tasks(cache.tasks)
+        return
+
+    with _log_file().open("ab") as f:
+        f.write(json_codec.dumps_bytes(op) + b"\n")
+        log_size = f.tell()
+    if log_size > LOG_COMPACT_BYTES:
+        save_tasks(cache.tasks)
+        return
+    # Keep the updated cache, so the next load skips the replay.
+    cache.signature = _files_signature()
+    _TASKS_CACHE = cache
 
 
 # Compute the next task id based on existing records.
 def next_id(tasks: list[dict]) -> int:
     """Get the next numeric task id."""
-    if not tasks:
-        return 1
-    return max(task["id"] for task in tasks) + 1
+    if _TASKS_CACHE is not None and _TASKS_CACHE.tasks is tasks:
+        return _TASKS_CACHE.max_id + 1
+    return max((task["id"] for task in tasks), default=0) + 1
 
 
 # Create and persist a new incomplete task.
-def add_task(title: str) -> None:
-    """Add a new task with done=False and save it."""
-    tasks = load_tasks()
-    task = {"id": next_id(tasks), "title": title, "done": False}
-    tasks.append(task)
-    save_tasks(tasks)
-    print(f"Added task #{task['id']}: {task['title']}")
+def add_task(title: str) -> str:
+    """Add a new task with done=False, save it, and return a confirmation line."""
+    cache = _load_cache()
+    task = {"id": next_id(cache.tasks), "title": title, "done": False}
+    cache.tasks.append(task)
+    cache.by_id[task["id"]] = task
+    cache.max_id = task["id"]
+    _record_mutation({"op": "add", "task": task}, cache)
+    return f"Added task #{task['id']}: {task['title']}"
 
 
-# Display tasks in a simple numbered checklist format.
-def list_tasks() -> None:
-    """Print all tasks in a simple format."""
+# Format tasks as a simple numbered checklist.
+def list_tasks() -> str:
+    """Return all tasks in a simple format, one task per line."""
     tasks = load_tasks()
     if not tasks:
-        print("No tasks yet.")
-        return
+        return "No tasks yet."
 
+    lines = []
     for task in tasks:
         status = "[x]" if task["done"] else "[ ]"
-        print(f"{task['id']}. {status} {task['title']}")
+        lines.append(f"{task['id']}. {status} {task['title']}")
+    return "\n".join(lines)
 
 
 # Mark a task as complete by its numeric id.
-def mark_done(task_id: int) -> None:
-    """Mark one task as done by id."""
-    tasks = load_tasks()
-    for task in tasks:
-        if task["id"] == task_id:
-            task["done"] = True
-            save_tasks(tasks)
-            print(f"Marked task #{task_id} as done.")
-            return
+def mark_done(task_id: int) -> str:
+    """Mark one task as done by id and return the outcome message."""
+    cache = _load_cache()
+    task = cache.by_id.get(task_id)
+    if task is None:
+        return f"Task #{task_id} not found."
 
-    print(f"Task #{task_id} not found.")
+    task["done"] = True
+    _record_mutation({"op": "done", "id": task_id}, cache)
+    return f"Marked task #{task_id} as done."
 
 
 # Delete one task by its numeric id.
-def delete_task(task_id: int) -> None:
-    """Delete one task by id."""
-    tasks = load_tasks()
-    for idx, task in enumerate(tasks):
-        if task["id"] == task_id:
-            deleted_title = task["title"]
-            del tasks[idx]
-            save_tasks(tasks)
-            print(f"Deleted task #{task_id}: {deleted_title}")
-            return
+def delete_task(task_id: int) -> str:
+    """Delete one task by id and return the outcome message."""
+    cache = _load_cache()
+    task = cache.by_id.pop(task_id, None)
+    if task is None:
+        return f"Task #{task_id} not found."
 
-    print(f"Task #{task_id} not found.")
+    # list.remove matches by identity before equality, so this is a pointer scan.
+    cache.tasks.remove(task)
+    # Only deleting the highest id changes the maximum (freed ids are reused).
+    if task_id == cache.max_id:
+        cache.max_id = max(cache.by_id, default=0)
+    _record_mutation({"op": "delete", "ids": [task_id]}, cache)
+    return f"Deleted task #{task_id}: {task['title']}"
 
 
 # Delete multiple tasks by their numeric ids in one deterministic operation.
-def delete_tasks(task_ids: list[int]) -> None:
-    """Delete all tasks whose ids are included in task_ids."""
-    # Keep first-seen order while removing duplicates.
-    unique_ids = list(dict.fromkeys(task_ids))
-    if not unique_ids:
-        print("No tasks deleted.")
-        return
-
-    tasks = load_tasks()
-    id_set = set(unique_ids)
-    deleted = [task for task in tasks if task["id"] in id_set]
-    if not deleted:
-        print("No tasks deleted.")
-        return
+def delete_tasks(task_ids: list[int]) -> str:
+    """Delete all tasks whose ids are included in task_ids and return a summary."""
+    cache = _load_cache()
+    # The set drops duplicate and unknown ids in one step.
+    id_set = {task_id for task_id in task_ids if task_id in cache.by_id}
+    if not id_set:
+        return "No tasks deleted."
 
-    deleted_ids = [task["id"] for task in deleted]
-    remaining = [task for task in tasks if task["id"] not in id_set]
-    save_tasks(remaining)
+    # One pass partitions the list; deleted ids are reported in task-list order.
+    remaining: list[dict] = []
+    deleted_ids: list[int] = []
+    for task in cache.tasks:
+        if task["id"] in id_set:
+            deleted_ids.append(task["id"])
+        else:
+            remaining.append(task)
+    cache.tasks = remaining
+    for task_id in deleted_ids:
+        del cache.by_id[task_id]
+    if cache.max_id in id_set:
+        cache.max_id = max(cache.by_id, default=0)
+    _record_mutation({"op": "delete", "ids": deleted_ids}, cache)
     ids_text = ", ".join(str(task_id) for task_id in deleted_ids)
-    print(f"Deleted {len(deleted_ids)} task(s): {ids_text}")
+    return f"Deleted {len(deleted_ids)} task(s): {ids_text}"
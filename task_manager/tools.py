@@ -12,9 +12,7 @@ Important principle:
 
 from __future__ import annotations
 
-import io
 import json
-from contextlib import redirect_stdout
 
 from storage import add_task as storage_add_task
 from storage import delete_task as storage_delete_task
@@ -113,22 +111,6 @@ TOOL_SCHEMAS = [
 ]
 
 
-def _capture_storage_output(func, *args) -> str:
-    """Capture printed output from storage functions and return it as text.
-
-    Storage functions already implement behavior and print user-facing results.
-    The tool layer reuses that behavior without duplicating business logic.
-    """
-    # Create an in-memory text buffer to collect stdout output.
-    buffer = io.StringIO()
-    # Redirect all `print(...)` output inside this block into `buffer`.
-    with redirect_stdout(buffer):
-        # Execute the storage function with forwarded positional arguments.
-        func(*args)
-    # Return captured text; if nothing was printed, return a default success marker.
-    return buffer.getvalue().strip() or "OK"
-
-
 def _parse_tool_args(raw_arguments: str) -> dict:
     """Parse model-provided JSON arguments into a dictionary."""
     if not raw_arguments:
@@ -153,24 +135,24 @@ def run_tool_call(tool_name: str, raw_arguments: str) -> str:
         text = args.get("text")
         if not isinstance(text, str) or not text.strip():
             return "Error: 'text' is required and must be a non-empty string."
-        return _capture_storage_output(storage_add_task, text)
+        return storage_add_task(text)
 
     if tool_name == "list_tasks":
         if args:
             return "Error: 'list_tasks' does not accept arguments."
-        return _capture_storage_output(storage_list_tasks)
+        return storage_list_tasks()
 
     if tool_name == "complete_task":
         task_id = args.get("task_id")
         if not isinstance(task_id, int):
             return "Error: 'task_id' is required and must be an integer."
-        return _capture_storage_output(storage_mark_done, task_id)
+        return storage_mark_done(task_id)
 
     if tool_name == "delete_task":
         task_id = args.get("task_id")
         if not isinstance(task_id, int):
             return "Error: 'task_id' is required and must be an integer."
-        return _capture_storage_output(storage_delete_task, task_id)
+        return storage_delete_task(task_id)
 
     if tool_name == "delete_tasks":
         task_ids = args.get("task_ids")
@@ -178,6 +160,6 @@ def run_tool_call(tool_name: str, raw_arguments: str) -> str:
             return "Error: 'task_ids' is required and must be a non-empty array of integers."
         if not all(isinstance(task_id, int) for task_id in task_ids):
             return "Error: 'task_ids' must contain only integers."
-        return _capture_storage_output(storage_delete_tasks, task_ids)
+        return storage_delete_tasks(task_ids)
 
     return f"Error: unknown tool '{tool_name}'."
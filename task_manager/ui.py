@@ -8,10 +8,25 @@ Separation of concerns:
 
 from __future__ import annotations
 
-from typing import Callable
-
-from PySide6.QtCore import QObject, QThread, Signal, Slot
-from PySide6.QtGui import QColor, QFontDatabase
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import queue
+import sys
+import threading
+from typing import Callable, Iterator
+
+from PySide6.QtCore import (
+    QAbstractItemModel,
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    Qt,
+    QTimer,
+    Signal,
+    Slot,
+)
+from PySide6.QtGui import QColor, QFontDatabase, QFontMetrics, QTextCursor
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QApplication,
@@ -23,10 +38,8 @@ from PySide6.QtWidgets import (
     QPushButton,
     QStackedWidget,
     QSplitter,
-    QTableWidget,
-    QTableWidgetItem,
-    QTreeWidget,
-    QTreeWidgetItem,
+    QTableView,
+    QTreeView,
     QTextEdit,
     QVBoxLayout,
     QWidget,
@@ -46,27 +59,62 @@ class QtWindowRunner:
         return self._app.exec()
 
 
+@dataclass(slots=True, frozen=True)
+class ProgressEvent:
+    """One backend progress event with typed fields instead of dict lookups."""
+
+    timestamp: str = ""
+    type: str = ""
+    name: str = ""
+    details: str = ""
+    step: int | None = None
+
+    @classmethod
+    def from_dict(cls, event: dict) -> ProgressEvent:
+        """Convert one event dict from the agent; missing keys take the defaults.
+
+        Types and names repeat across events and runs, so they are interned: rows
+        share one string each and color lookups hit on identity.
+        """
+        return cls(
+            event.get("timestamp", ""),
+            sys.intern(str(event.get("type", ""))),
+            sys.intern(str(event.get("name", ""))),
+            event.get("details", ""),
+            event.get("step"),
+        )
+
+
 class GoalWorker(QObject):
     """Background worker that runs backend goal execution off the UI thread."""
 
-    progress_event = Signal(dict)
     completed = Signal(str)
     failed = Signal(str)
     finished = Signal()
 
-    def __init__(self, submit_goal: Callable[..., str], goal: str) -> None:
+    def __init__(
+        self,
+        submit_goal: Callable[..., str],
+        on_event: Callable[[ProgressEvent], None],
+    ) -> None:
         super().__init__()
         self._submit_goal = submit_goal
-        self._goal = goal
+        # Called on this worker's thread; must be thread-safe (see UiController.post_progress_event).
+        self._on_event = on_event
 
-    @Slot()
-    def run(self) -> None:
-        """Execute backend callback and stream events."""
-        try:
-            def on_event(event: dict) -> None:
-                self.progress_event.emit(event)
+    def _forward_event(self, event: dict) -> None:
+        """Convert one backend event dict once, here on the worker thread."""
+        self._on_event(ProgressEvent.from_dict(event))
+
+    def serve(self, goals: queue.SimpleQueue[str | None]) -> None:
+        """Run queued goals one at a time until a None sentinel arrives."""
+        for goal in iter(goals.get, None):
+            self.run_goal(goal)
 
-            result = self._submit_goal(self._goal, on_event=on_event)
+    def run_goal(self, goal: str) -> None:
+        """Execute backend callback for one goal and stream events."""
+        try:
+            result = self._submit_goal(goal, on_event=self._forward_event)
             self.completed.emit(result)
         except Exception as exc:
             self.failed.emit(str(exc))
@@ -74,43 +122,255 @@ class GoalWorker(QObject):
             self.finished.emit()
 
 
-def _make_table_item(text: str) -> QTableWidgetItem:
-    return QTableWidgetItem(text)
+# Soft background color per event type for scan-friendly logs. Built once; the
+# models share these instances instead of constructing colors per event.
+_EVENT_COLORS: dict[str, QColor] = {
+    "goal": QColor("#F4F4F4"),
+    "agent_start": QColor("#E8F4FD"),
+    "skill_route": QColor("#FFE8CC"),
+    "skill_used": QColor("#EAF8EF"),
+    "step_start": QColor("#EEF3FF"),
+    "tool_called": QColor("#FFF7E0"),
+    "tool_result": QColor("#EAF8EF"),
+    "stop": QColor("#F3F4F6"),
+    "error": QColor("#FDECEC"),
+}
+_DEFAULT_EVENT_COLOR = QColor("#FFFFFF")
 
 
 def _event_background_color(event_type: str) -> QColor:
-    """Return a soft background color per event type for scan-friendly logs."""
-    palette = {
-        "goal": QColor("#F4F4F4"),
-        "agent_start": QColor("#E8F4FD"),
-        "skill_route": QColor("#FFE8CC"),
-        "skill_used": QColor("#EAF8EF"),
-        "step_start": QColor("#EEF3FF"),
-        "tool_called": QColor("#FFF7E0"),
-        "tool_result": QColor("#EAF8EF"),
-        "stop": QColor("#F3F4F6"),
-        "error": QColor("#FDECEC"),
-    }
-    return palette.get(event_type, QColor("#FFFFFF"))
-
-
-def _set_tree_item_background(item: QTreeWidgetItem, color: QColor) -> None:
-    """Apply the same background color to all columns in a tree row."""
-    for col in range(item.columnCount()):
-        item.setBackground(col, color)
+    """Return the shared background color for one event type."""
+    return _EVENT_COLORS.get(event_type, _DEFAULT_EVENT_COLOR)
+
+
+PROGRESS_HEADERS = ("#", "Time", "Type", "Name", "Details")
+
+# One progress event as displayed: (sequence, time, type, name, details). Values
+# are stored as received (the agent sends strings; the sequence is an int) and only
+# turned into text when a cell is actually painted or copied.
+ProgressRow = tuple[object, object, object, object, object]
+
+
+def _display_text(value: object) -> str:
+    """Return a stored cell value as display text."""
+    return value if isinstance(value, str) else str(value)
+
+
+# Progress events arriving within one interval are applied to the views together.
+PROGRESS_FLUSH_INTERVAL_MS = 16
+
+# The table keeps only this many newest rows of the selected run, so paint cost and
+# model memory stay bounded over long sessions. Copied reports still hold every row.
+PROGRESS_MAX_ROWS = 50_000
+
+# How long closing the window waits for a running goal before abandoning it.
+WORKER_SHUTDOWN_TIMEOUT_S = 2.0
+
+# Representative widest values for the table's fixed-width columns (the last
+# column stretches). Widths are measured once instead of resized to contents.
+_PROGRESS_COLUMN_SAMPLES = ("9999", "00:00:00", "agent_start", "reasonable_name_width")
+
+
+class ProgressModel(QAbstractTableModel):
+    """Table model over `(seq, time, type, name, details)` rows stored column by column.
+
+    Each column is its own Python list and cells are produced on demand in `data()`,
+    so an appended event costs five list slots instead of five `QTableWidgetItem`
+    objects, and painting one column walks one contiguous list.
+    Appends stay amortized O(1) because lists over-allocate geometrically; any
+    replacement backing store (arrays, buffers) must keep that growth policy.
+    Past `max_rows`, the oldest rows are dropped from the head as new ones arrive.
+    """
+
+    def __init__(self, parent: QObject | None = None, max_rows: int = PROGRESS_MAX_ROWS) -> None:
+        super().__init__(parent)
+        self._columns: list[list[object]] = [[] for _ in PROGRESS_HEADERS]
+        self._colors: list[QColor] = []
+        self._max_rows = max_rows
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._colors)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(PROGRESS_HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return PROGRESS_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        # Only the two roles the view paints are answered; every other role is None.
+        if role == Qt.DisplayRole:
+            return _display_text(self._columns[index.column()][index.row()])
+        if role == Qt.BackgroundRole:
+            return self._colors[index.row()]
+        return None
+
+    def set_max_rows(self, max_rows: int) -> None:
+        """Change the row cap, dropping the oldest rows if the model is already over it."""
+        if max_rows < 1:
+            raise ValueError("max_rows must be at least 1")
+        self._max_rows = max_rows
+        self._drop_oldest(len(self._colors) - max_rows)
+
+    def _drop_oldest(self, count: int) -> None:
+        """Remove the first `count` rows (if any) with one removal notification."""
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        for column in self._columns:
+            del column[:count]
+        del self._colors[:count]
+        self.endRemoveRows()
+
+    def extend_rows(self, rows: list[ProgressRow]) -> None:
+        """Append rows and notify attached views with one insertion for the whole batch."""
+        rows = rows[-self._max_rows:]
+        self._drop_oldest(len(self._colors) + len(rows) - self._max_rows)
+        first = len(self._colors)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for column, values in zip(self._columns, zip(*rows)):
+            column.extend(values)
+        self._colors.extend(_event_background_color(row_values[2]) for row_values in rows)
+        self.endInsertRows()
+
+    def set_rows(self, rows: list[ProgressRow]) -> None:
+        """Replace all rows in one model reset (used when switching goal runs)."""
+        rows = rows[-self._max_rows:]
+        self.beginResetModel()
+        self._columns = [[row_values[column] for row_values in rows] for column in range(len(PROGRESS_HEADERS))]
+        self._colors = [_event_background_color(row_values[2]) for row_values in rows]
+        self.endResetModel()
+
+
+@contextmanager
+def _bulk_update(*widgets: QWidget) -> Iterator[None]:
+    """Suspend painting and signals on `widgets` while many rows change at once.
+
+    The widgets repaint once when the block ends instead of after every change.
+    """
+    previous = [(widget, widget.updatesEnabled(), widget.blockSignals(True)) for widget in widgets]
+    for widget, _, _ in previous:
+        widget.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        for widget, updates_enabled, signals_blocked in previous:
+            widget.blockSignals(signals_blocked)
+            widget.setUpdatesEnabled(updates_enabled)
+
+
+def _is_scrolled_to_bottom(view: QAbstractItemView) -> bool:
+    """Return True when the view shows its last rows (or has nothing to scroll)."""
+    scroll_bar = view.verticalScrollBar()
+    return scroll_bar.value() >= scroll_bar.maximum()
+
+
+# Parent id of top-level (goal) nodes in ProgressTreeModel.
+TREE_ROOT = -1
+
+
+@dataclass(slots=True)
+class _TreeNode:
+    """One progress tree row; nodes refer to each other by index into the model's list."""
+
+    parent: int
+    # Position among the parent's children, needed to build the parent's QModelIndex.
+    row: int
+    values: ProgressRow
+    color: QColor
+    children: list[int] = field(default_factory=list)
+
+
+class ProgressTreeModel(QAbstractItemModel):
+    """Goal -> step/routing -> event hierarchy stored as a flat list of nodes.
+
+    A QModelIndex carries its node's integer id, so parent/child lookups are list
+    indexing and an added event costs one small node instead of a QTreeWidgetItem.
+    """
+
+    def __init__(self, parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._nodes: list[_TreeNode] = []
+        self._top_level: list[int] = []
+
+    def _children(self, node_id: int) -> list[int]:
+        return self._top_level if node_id == TREE_ROOT else self._nodes[node_id].children
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        children = self._children(parent.internalId() if parent.isValid() else TREE_ROOT)
+        if not 0 <= row < len(children) or not 0 <= column < len(PROGRESS_HEADERS):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QModelIndex | None = None):
+        # Called without an index this is QObject.parent(), which the override shadows.
+        if index is None:
+            return super().parent()
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_of(self._nodes[index.internalId()].parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.column() > 0:
+            return 0
+        return len(self._children(parent.internalId() if parent.isValid() else TREE_ROOT))
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(PROGRESS_HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return PROGRESS_HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return _display_text(self._nodes[index.internalId()].values[index.column()])
+        if role == Qt.BackgroundRole:
+            return self._nodes[index.internalId()].color
+        return None
+
+    def index_of(self, node_id: int) -> QModelIndex:
+        """Return the column-0 index of one node (invalid for TREE_ROOT)."""
+        if node_id == TREE_ROOT:
+            return QModelIndex()
+        return self.createIndex(self._nodes[node_id].row, 0, node_id)
+
+    def add_node(self, parent_id: int, values: ProgressRow, color: QColor) -> int:
+        """Append one node under `parent_id` and return the new node id."""
+        siblings = self._children(parent_id)
+        row = len(siblings)
+        node_id = len(self._nodes)
+        self.beginInsertRows(self.index_of(parent_id), row, row)
+        self._nodes.append(_TreeNode(parent_id, row, values, color))
+        siblings.append(node_id)
+        self.endInsertRows()
+        return node_id
+
+    def clear(self) -> None:
+        """Remove every node in one model reset."""
+        self.beginResetModel()
+        self._nodes = []
+        self._top_level = []
+        self.endResetModel()
 
 
 class UiController(QObject):
     """Main-thread controller for safe UI updates from worker signals."""
 
+    # Argument-free wake-up for the GUI thread; the events themselves travel in `_inbox`.
+    _events_posted = Signal()
+
     def __init__(
         self,
         submit_goal: Callable[..., str],
         goal_input: QLineEdit,
         submit_button: QPushButton,
         output_box: QTextEdit,
-        progress_table: QTableWidget,
-        progress_tree: QTreeWidget,
+        progress_table: QTableView,
+        progress_tree: QTreeView,
         progress_view_stack: QStackedWidget,
         goal_selector: QComboBox,
         view_selector: QComboBox,
@@ -124,7 +384,9 @@ class UiController(QObject):
         self._submit_button = submit_button
         self._output_box = output_box
         self._progress_table = progress_table
+        self._progress_model: ProgressModel = progress_table.model()
         self._progress_tree = progress_tree
+        self._progress_tree_model: ProgressTreeModel = progress_tree.model()
         self._progress_view_stack = progress_view_stack
         self._goal_selector = goal_selector
         self._view_selector = view_selector
@@ -134,24 +396,66 @@ class UiController(QObject):
         self._run_counter = 0
         self._active_run_id: str | None = None
         self._selected_run_id: str | None = None
-        self._run_rows: dict[str, list[tuple[str, str, str, str, str]]] = {}
+        self._run_rows: dict[str, list[ProgressRow]] = {}
         self._run_goals: dict[str, str] = {}
-        self._run_root_nodes: dict[str, QTreeWidgetItem] = {}
-        self._run_skill_route_nodes: dict[str, QTreeWidgetItem] = {}
-        self._run_step_nodes: dict[str, dict[int, QTreeWidgetItem]] = {}
-        self._thread: QThread | None = None
-        self._worker: GoalWorker | None = None
+        self._run_root_nodes: dict[str, int] = {}
+        self._run_skill_route_nodes: dict[str, int] = {}
+        self._run_step_nodes: dict[str, dict[int, int]] = {}
+        # One worker thread for the window's lifetime takes goals from a queue
+        # instead of a thread being created and torn down per goal. It is a daemon
+        # thread, so a goal still running at exit cannot keep the process alive.
+        # The worker's signals are emitted from that thread and queued to this one.
+        self._busy = False
+        self._goals: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+        self._worker = GoalWorker(submit_goal, self.post_progress_event)
+        self._worker.completed.connect(self.on_worker_completed)
+        self._worker.failed.connect(self.on_worker_failed)
+        self._worker.finished.connect(self.on_worker_finished)
+        self._worker_thread = threading.Thread(
+            target=self._worker.serve,
+            args=(self._goals,),
+            name="goal-worker",
+            daemon=True,
+        )
+        self._worker_thread.start()
+        # The worker thread appends events here and the GUI thread pops them;
+        # deque append/popleft are atomic in CPython, so no lock is needed. At most
+        # one wake-up signal is in flight per batch, and the timer coalesces bursts
+        # into one flush per frame (~16 ms).
+        self._inbox: deque[ProgressEvent] = deque()
+        self._wake_pending = False
+        self._events_posted.connect(self._on_events_posted)
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(PROGRESS_FLUSH_INTERVAL_MS)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush_pending_events)
+        # Tree rows are only built while the tree page is showing; meanwhile their
+        # `(run_id, row_values, step)` records wait here in arrival order.
+        self._pending_tree_rows: list[tuple[str, ProgressRow, object]] = []
+        # Likewise the table model skips appends while the tree page is showing and
+        # is re-rendered from `_run_rows` when the table is shown again.
+        self._table_is_stale = False
         self._reset_progress_views()
-        self.on_view_mode_changed(self._view_selector.currentText())
+        # View switches are applied on the next event-loop tick, after the combo box
+        # settles, and only when the mode actually differs from the shown one.
+        self._view_mode: str | None = None
+        self._view_mode_timer = QTimer(self)
+        self._view_mode_timer.setInterval(0)
+        self._view_mode_timer.setSingleShot(True)
+        self._view_mode_timer.timeout.connect(self._apply_view_mode)
+        self._apply_view_mode()
 
     def _set_busy(self, is_busy: bool) -> None:
         self._submit_button.setEnabled(not is_busy)
         self._goal_input.setEnabled(not is_busy)
+        # Shown only while the output box is empty, i.e. until the first answer token arrives.
+        self._output_box.setPlaceholderText("Working..." if is_busy else "")
 
     def _reset_progress_views(self) -> None:
         """Clear all progress history and UI representations."""
-        self._progress_table.setRowCount(0)
-        self._progress_tree.clear()
+        with _bulk_update(self._progress_table, self._progress_tree):
+            self._progress_model.set_rows([])
+            self._progress_tree_model.clear()
         self._goal_selector.blockSignals(True)
         self._goal_selector.clear()
         self._goal_selector.blockSignals(False)
@@ -162,25 +466,21 @@ class UiController(QObject):
         self._run_root_nodes.clear()
         self._run_skill_route_nodes.clear()
         self._run_step_nodes.clear()
+        self._pending_tree_rows.clear()
+        self._table_is_stale = False
         self._run_counter = 0
 
-    def _append_table_row(self, row_values: tuple[str, str, str, str, str]) -> None:
-        """Append one row to table view with event-type color coding."""
-        color = _event_background_color(row_values[2])
-        row = self._progress_table.rowCount()
-        self._progress_table.insertRow(row)
-        for col, value in enumerate(row_values):
-            item = _make_table_item(value)
-            item.setBackground(color)
-            self._progress_table.setItem(row, col, item)
+    def set_max_rows(self, max_rows: int) -> None:
+        """Cap how many of the selected run's newest rows the table shows."""
+        self._progress_model.set_max_rows(max_rows)
 
     def _render_selected_run_table(self) -> None:
         """Render table rows only for the currently selected goal run."""
-        self._progress_table.setRowCount(0)
+        self._table_is_stale = False
         if self._selected_run_id is None:
+            self._progress_model.set_rows([])
             return
-        for row_values in self._run_rows.get(self._selected_run_id, []):
-            self._append_table_row(row_values)
+        self._progress_model.set_rows(self._run_rows.get(self._selected_run_id, []))
         self._progress_table.scrollToBottom()
 
     def _start_new_run(self, goal: str) -> None:
@@ -197,97 +497,164 @@ class UiController(QObject):
         self._run_goals[run_id] = goal_text
         self._run_step_nodes[run_id] = {}
 
-        goal_root = QTreeWidgetItem(["", "", "goal", run_label, goal_text])
-        _set_tree_item_background(goal_root, _event_background_color("goal"))
-        goal_root.setExpanded(True)
+        goal_root = self._add_tree_node(
+            TREE_ROOT, ("", "", "goal", run_label, goal_text), _event_background_color("goal")
+        )
         self._run_root_nodes[run_id] = goal_root
-        self._progress_tree.addTopLevelItem(goal_root)
 
         self._goal_selector.blockSignals(True)
         self._goal_selector.addItem(run_label, run_id)
         self._goal_selector.setCurrentIndex(self._goal_selector.count() - 1)
         self._goal_selector.blockSignals(False)
         self._render_selected_run_table()
-        self._progress_tree.scrollToItem(goal_root)
+        self._progress_tree.scrollTo(self._progress_tree_model.index_of(goal_root))
+
+    def _add_tree_node(self, parent_id: int, values: ProgressRow, color: QColor) -> int:
+        """Add one tree node; a parent is expanded when it gets its first child.
 
-    def _get_step_node(self, run_id: str, step: int) -> QTreeWidgetItem:
+        Only goal, step, and routing nodes ever have children, and they start expanded.
+        """
+        node_id = self._progress_tree_model.add_node(parent_id, values, color)
+        if parent_id != TREE_ROOT and self._progress_tree_model.rowCount(
+            self._progress_tree_model.index_of(parent_id)
+        ) == 1:
+            self._progress_tree.expand(self._progress_tree_model.index_of(parent_id))
+        return node_id
+
+    def _ensure_step_node(self, run_id: str, step: int) -> int:
         """Return existing step node for one run or create it in first-seen order."""
         step_nodes = self._run_step_nodes.setdefault(run_id, {})
         if step in step_nodes:
             return step_nodes[step]
 
-        parent = self._run_root_nodes.get(run_id, self._progress_tree.invisibleRootItem())
-        step_item = QTreeWidgetItem(["", "", "step", f"Step {step}", ""])
-        parent.addChild(step_item)
-        step_item.setExpanded(True)
-        _set_tree_item_background(step_item, _event_background_color("step_start"))
-        step_nodes[step] = step_item
-        return step_item
-
-    def _start_worker(self, goal: str) -> None:
-        """Start backend call in a worker thread so UI remains responsive."""
-        thread = QThread(self)
-        worker = GoalWorker(self._submit_goal, goal)
-        worker.moveToThread(thread)
-
-        thread.started.connect(worker.run)
-        worker.progress_event.connect(self.on_progress_event)
-        worker.completed.connect(self.on_worker_completed)
-        worker.failed.connect(self.on_worker_failed)
-        worker.finished.connect(thread.quit)
-        worker.finished.connect(worker.deleteLater)
-        thread.finished.connect(thread.deleteLater)
-        thread.finished.connect(self.on_worker_finished)
-
-        self._thread = thread
-        self._worker = worker
-        thread.start()
-
-    @Slot(dict)
-    def on_progress_event(self, event: dict) -> None:
-        """Append one backend instrumentation event in chronological order."""
+        parent = self._run_root_nodes.get(run_id, TREE_ROOT)
+        step_node = self._add_tree_node(
+            parent, ("", "", "step", f"Step {step}", ""), _event_background_color("step_start")
+        )
+        step_nodes[step] = step_node
+        return step_node
+
+    @Slot()
+    def shutdown(self) -> None:
+        """Stop the worker thread, waiting at most WORKER_SHUTDOWN_TIMEOUT_S for it.
+
+        A goal that is still running after that is abandoned: it ends with the
+        process, whose atexit handlers close the agent's MCP clients.
+        """
+        self._goals.put(None)
+        self._worker_thread.join(WORKER_SHUTDOWN_TIMEOUT_S)
+
+    def post_progress_event(self, event: ProgressEvent) -> None:
+        """Queue one backend event from any thread; the GUI thread applies it in a batch.
+
+        Only the first event of a batch emits a (queued) signal, so a burst costs
+        one cross-thread wake-up instead of one queued signal per event.
+        """
+        self._inbox.append(event)
+        if not self._wake_pending:
+            self._wake_pending = True
+            self._events_posted.emit()
+
+    @Slot()
+    def _on_events_posted(self) -> None:
+        # Clear the flag before the flush drains the inbox: an event appended after
+        # this point either gets drained or sends a fresh wake-up.
+        self._wake_pending = False
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending_events(self) -> None:
+        """Apply all queued events in chronological order with one update per view.
+
+        Bursts of tool events become one table insertion, one output-box insert for
+        streamed tokens, and one scroll per view instead of one of each per event.
+        """
+        self._flush_timer.stop()
+        inbox = self._inbox
+        events = [inbox.popleft() for _ in range(len(inbox))]
         run_id = self._active_run_id
-        if run_id is None:
+        if run_id is None or not events:
             return
 
+        # Follow new rows only in views the user has not scrolled away from the end of.
+        table_follows = _is_scrolled_to_bottom(self._progress_table)
+        tree_follows = _is_scrolled_to_bottom(self._progress_tree)
         run_rows = self._run_rows.setdefault(run_id, [])
-        sequence = str(len(run_rows) + 1)
-        timestamp = str(event.get("timestamp", ""))
-        event_type = str(event.get("type", ""))
-        name = str(event.get("name", ""))
-        details = str(event.get("details", ""))
-        step = event.get("step")
+        first_new_row = len(run_rows)
+        tree_is_visible = self._progress_view_stack.currentIndex() == 1
+        tokens: list[str] = []
+        # The agent streams every step's text, but only the step that ends the run
+        # holds the answer: a new step discards whatever the previous one streamed.
+        new_step_started = False
+        last_tree_item: int | None = None
+        with _bulk_update(self._progress_table, self._progress_tree):
+            for event in events:
+                if event.type == "token":
+                    # Streamed answer text goes to the output box, not the progress log.
+                    tokens.append(str(event.details))
+                    continue
+                if event.type == "step_start":
+                    tokens.clear()
+                    new_step_started = True
+                row_values, step = self._add_progress_row(run_rows, event)
+                if tree_is_visible:
+                    last_tree_item = self._add_tree_row(run_id, row_values, step)
+                else:
+                    self._pending_tree_rows.append((run_id, row_values, step))
+
+            if run_id == self._selected_run_id and len(run_rows) > first_new_row:
+                if tree_is_visible:
+                    # The hidden table is re-rendered once when it is shown again.
+                    self._table_is_stale = True
+                else:
+                    self._progress_model.extend_rows(run_rows[first_new_row:])
+
+        if new_step_started:
+            self._output_box.setPlainText("".join(tokens))
+        elif tokens:
+            self._output_box.moveCursor(QTextCursor.MoveOperation.End)
+            self._output_box.insertPlainText("".join(tokens))
+
+        if table_follows and not tree_is_visible and len(run_rows) > first_new_row:
+            self._progress_table.scrollToBottom()
+        if last_tree_item is not None and tree_follows:
+            self._progress_tree.scrollTo(self._progress_tree_model.index_of(last_tree_item))
+
+    def _add_progress_row(
+        self,
+        run_rows: list[ProgressRow],
+        event: ProgressEvent,
+    ) -> tuple[ProgressRow, object]:
+        """Record one event as a row of its run; return the row and the event's step."""
+        details = event.details
+        step = event.step
         if step is not None:
             details = f"step={step} | {details}" if details else f"step={step}"
-        row_values = (sequence, timestamp, event_type, name, details)
+        row_values = (len(run_rows) + 1, event.timestamp, event.type, event.name, details)
         run_rows.append(row_values)
+        return row_values, step
 
-        if run_id == self._selected_run_id:
-            self._append_table_row(row_values)
-            self._progress_table.scrollToBottom()
-
+    def _add_tree_row(
+        self,
+        run_id: str,
+        row_values: ProgressRow,
+        step: object,
+    ) -> int:
+        """Add one recorded row under its goal, step, or routing node; return the new node id."""
+        event_type = row_values[2]
         color = _event_background_color(event_type)
-        parent = self._run_root_nodes.get(run_id, self._progress_tree.invisibleRootItem())
+        parent = self._run_root_nodes.get(run_id, TREE_ROOT)
         if isinstance(step, int):
-            parent = self._get_step_node(run_id, step)
+            parent = self._ensure_step_node(run_id, step)
         elif event_type == "skill_route":
             # Keep per-goal routing node so selected skills can be nested under it.
-            route_node = QTreeWidgetItem([sequence, timestamp, event_type, name, details])
-            parent.addChild(route_node)
-            _set_tree_item_background(route_node, color)
-            route_node.setExpanded(True)
+            route_node = self._add_tree_node(parent, row_values, color)
             self._run_skill_route_nodes[run_id] = route_node
-            self._progress_tree.scrollToItem(route_node)
-            return
+            return route_node
         elif event_type == "skill_used":
-            route_node = self._run_skill_route_nodes.get(run_id)
-            if route_node is not None:
-                parent = route_node
+            parent = self._run_skill_route_nodes.get(run_id, parent)
 
-        tree_item = QTreeWidgetItem([sequence, timestamp, event_type, name, details])
-        parent.addChild(tree_item)
-        _set_tree_item_background(tree_item, color)
-        self._progress_tree.scrollToItem(tree_item)
+        return self._add_tree_node(parent, row_values, color)
 
     def _build_progress_report_text(self, run_id: str | None) -> str:
         """Build a compact TSV report for one selected goal run.
@@ -295,13 +662,13 @@ class UiController(QObject):
         We use compact, non-padded lines so long details do not expand all
         columns into unreadable widths.
         """
-        headers = ("#", "Time", "Type", "Name", "Details")
+        headers = PROGRESS_HEADERS
         if run_id is None:
             return "(no goal selected)"
 
-        def clean(cell: str) -> str:
+        def clean(cell: object) -> str:
             # Keep each row single-line for stable copy/paste behavior.
-            return cell.replace("\r\n", "\n").replace("\r", "\n").replace("\n", "\\n")
+            return _display_text(cell).replace("\r\n", "\n").replace("\r", "\n").replace("\n", "\\n")
 
         goal_text = self._run_goals.get(run_id, "")
         rows = self._run_rows.get(run_id, [])
@@ -316,22 +683,37 @@ class UiController(QObject):
 
     @Slot(str)
     def on_worker_completed(self, result: str) -> None:
+        """Show the final result, reusing text already streamed into the output box.
+
+        The box holds only the last step's streamed text, which is usually the
+        answer itself, so replacing the whole document would only force a full
+        re-layout of identical text. Any other text is replaced by the result.
+        """
+        # Events queued just before completion belong before the result.
+        self._flush_pending_events()
+        streamed = self._output_box.toPlainText()
+        if result == streamed:
+            return
+        if streamed and result.startswith(streamed):
+            self._output_box.moveCursor(QTextCursor.MoveOperation.End)
+            self._output_box.insertPlainText(result[len(streamed):])
+            return
         self._output_box.setPlainText(result)
 
     @Slot(str)
     def on_worker_failed(self, error_text: str) -> None:
+        self._flush_pending_events()
         self._output_box.setPlainText(f"UI worker failed: {error_text}")
 
     @Slot()
     def on_worker_finished(self) -> None:
+        self._busy = False
         self._set_busy(False)
-        self._thread = None
-        self._worker = None
 
     @Slot()
     def on_submit(self) -> None:
         """Submit click handler: invoke backend and render streamed progress."""
-        if self._thread is not None and self._thread.isRunning():
+        if self._busy:
             return
 
         goal = self._goal_input.text().strip()
@@ -342,8 +724,10 @@ class UiController(QObject):
             return
 
         self._start_new_run(goal)
+        self._busy = True
         self._set_busy(True)
-        self._start_worker(goal)
+        # Run the backend on the worker thread so the UI remains responsive.
+        self._goals.put(goal)
 
     @Slot(int)
     def on_goal_selection_changed(self, index: int) -> None:
@@ -354,16 +738,44 @@ class UiController(QObject):
         if self._selected_run_id is not None:
             root = self._run_root_nodes.get(self._selected_run_id)
             if root is not None:
-                self._progress_tree.scrollToItem(root)
+                self._progress_tree.scrollTo(self._progress_tree_model.index_of(root))
 
     @Slot(str)
     def on_view_mode_changed(self, mode: str) -> None:
-        """Switch between flat table and collapsible tree progress views."""
+        """Schedule a switch between flat table and collapsible tree progress views."""
+        if mode == self._view_mode:
+            # Back to the shown mode before the tick: drop the pending switch.
+            self._view_mode_timer.stop()
+            return
+        self._view_mode_timer.start()
+
+    def _apply_view_mode(self) -> None:
+        """Show the view mode currently selected in the combo box."""
+        mode = self._view_selector.currentText()
+        if mode == self._view_mode:
+            return
+        self._view_mode = mode
         is_tree = mode.lower() == "tree"
+        if is_tree:
+            self._build_pending_tree_rows()
+        elif self._table_is_stale:
+            self._render_selected_run_table()
         self._progress_view_stack.setCurrentIndex(1 if is_tree else 0)
         self._expand_button.setEnabled(is_tree)
         self._collapse_button.setEnabled(is_tree)
 
+    def _build_pending_tree_rows(self) -> None:
+        """Create tree items for rows recorded while the table page was showing."""
+        if not self._pending_tree_rows:
+            return
+        pending, self._pending_tree_rows = self._pending_tree_rows, []
+        follows = _is_scrolled_to_bottom(self._progress_tree)
+        with _bulk_update(self._progress_tree):
+            for run_id, row_values, step in pending:
+                last_tree_item = self._add_tree_row(run_id, row_values, step)
+        if follows:
+            self._progress_tree.scrollTo(self._progress_tree_model.index_of(last_tree_item))
+
     @Slot()
     def on_expand_tree(self) -> None:
         self._progress_tree.expandAll()
@@ -449,26 +861,34 @@ def create_window(submit_goal: Callable[..., str]) -> QtWindowRunner:
     progress_header_row.addWidget(copy_button)
     right_layout.addLayout(progress_header_row)
 
-    progress_table = QTableWidget(0, 5)
-    progress_table.setHorizontalHeaderLabels(["#", "Time", "Type", "Name", "Details"])
-    progress_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-    progress_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
-    progress_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeToContents)
-    progress_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeToContents)
+    progress_table = QTableView()
+    progress_table.setModel(ProgressModel(progress_table))
+    progress_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
+    progress_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Interactive)
+    progress_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Interactive)
+    progress_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Interactive)
     progress_table.horizontalHeader().setSectionResizeMode(4, QHeaderView.Stretch)
+    progress_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
     progress_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
     progress_table.setSelectionBehavior(QAbstractItemView.SelectRows)
     progress_table.setSelectionMode(QAbstractItemView.SingleSelection)
-
-    progress_tree = QTreeWidget()
-    progress_tree.setColumnCount(5)
-    progress_tree.setHeaderLabels(["#", "Time", "Type", "Name", "Details"])
+    # Rows are tinted through BackgroundRole alone: no alternating base, grid lines,
+    # or per-cell focus frame to draw on top of it.
+    progress_table.setAlternatingRowColors(False)
+    progress_table.setShowGrid(False)
+    progress_table.setFocusPolicy(Qt.NoFocus)
+
+    progress_tree = QTreeView()
+    progress_tree.setModel(ProgressTreeModel(progress_tree))
     progress_tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
     progress_tree.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
     progress_tree.header().setSectionResizeMode(2, QHeaderView.ResizeToContents)
     progress_tree.header().setSectionResizeMode(3, QHeaderView.ResizeToContents)
     progress_tree.header().setSectionResizeMode(4, QHeaderView.Stretch)
     progress_tree.setUniformRowHeights(True)
+    progress_tree.setRootIsDecorated(True)
+    # Expanding a node repaints once instead of animating over many frames.
+    progress_tree.setAnimated(False)
 
     progress_view_stack = QStackedWidget()
     progress_view_stack.addWidget(progress_table)
@@ -483,6 +903,13 @@ def create_window(submit_goal: Callable[..., str]) -> QtWindowRunner:
     progress_table.setFont(fixed_font)
     progress_tree.setFont(fixed_font)
 
+    # Fixed row height and preset column widths: inserting rows never triggers a
+    # size-to-contents pass over the whole table.
+    metrics = QFontMetrics(fixed_font)
+    progress_table.verticalHeader().setDefaultSectionSize(metrics.height() + 4)
+    for col, sample in enumerate(_PROGRESS_COLUMN_SAMPLES):
+        progress_table.setColumnWidth(col, metrics.horizontalAdvance(sample) + 16)
+
     controller = UiController(
         submit_goal=submit_goal,
         goal_input=goal_input,
@@ -508,5 +935,6 @@ def create_window(submit_goal: Callable[..., str]) -> QtWindowRunner:
 
     # Keep controller alive for the full window lifetime.
     window._controller = controller  # type: ignore[attr-defined]
+    app.aboutToQuit.connect(controller.shutdown)
 
     return QtWindowRunner(app, window)